@@ -0,0 +1,94 @@
+from settings import *
+from assets import load_spritesheet, load_spritesheet_masks
+
+RANK_MULTIPLIERS = {
+    'D': 1.0,
+    'C': 1.2,
+    'B': 1.5,
+    'A': 2.0,
+    'S': 3.5
+}
+
+ENEMY_RANK_COLORS = {
+    'S': (255, 0, 0),    # Red
+    'A': (255, 165, 150),  # Orange
+    'B': (255, 255, 0),  # Yellow
+    'C': (0, 255, 0),    # Green
+    'D': (0, 0, 255)     # Blue
+}
+
+ALLY_RANK_COLORS = {
+    'S': (100, 0, 0),    # Red
+    'A': (50, 50, 0),  # Orange
+    'B': (80, 80, 0),  # Yellow
+    'C': (50, 100, 50),    # Green
+    'D': (0, 0, 120)     # Blue
+}
+
+ACTION_MAP = {
+    'down_walk': 0,
+    'up_walk': 1,
+    'walk_right': 2,
+    'walk_left': 3,
+    'idle_down': 4,
+    'idle_up': 5,
+    'idle_right': 6,
+    'idle_left': 7,
+}
+
+# kind -> (tabela de dados, cores do rank, nome usado na mensagem de erro)
+KINDS = {
+    'enemy': (monster_data, ENEMY_RANK_COLORS, 'Monster'),
+    'ally': (ally_data, ALLY_RANK_COLORS, 'Ally'),
+}
+
+
+class Archetype:
+    """What every character of one (kind, name, rank) has in common, built once.
+
+    Holds the rank-scaled stats, the walk and death frames with one mask per frame,
+    the rank colour and the label text. Enemy and Ally keep a reference to it and copy
+    the stats they change during play (hp, speed, ...).
+    """
+
+    def __init__(self, kind, name, rank):
+        table, rank_colors, label = KINDS[kind]
+        data = table.get(name)
+        if not data:
+            raise ValueError(f"{label} data for '{name}' not found.")
+        self.kind = kind
+        self.name = name
+        self.rank = rank
+        self.data = data
+
+        multiplier = RANK_MULTIPLIERS.get(rank, 1.0)
+        self.multiplier = multiplier
+        self.hp = int(data['hp'] * multiplier)
+        self.speed = int(data['speed'] * multiplier)
+        self.behavior = data['behavior']
+        self.vision_radius = int(data['vision_radius'] * multiplier)
+        self.melee_skill = int(data['melee_skill'] * multiplier)
+        self.defense_skill = int(data['defense_skill'] * multiplier)
+        self.throw_speed = 0.8 * multiplier
+
+        self.sprites = load_spritesheet(data['graphic'], 64, 64, 4, 4, skip_empty=True)
+        self.masks = load_spritesheet_masks(data['graphic'], 64, 64, 4, 4, skip_empty=True)
+        self.death_sprites = load_spritesheet('images/effects/blood_splash.png', 64, 64, 1, 16, skip_empty=True)
+        self.death_masks = load_spritesheet_masks('images/effects/blood_splash.png', 64, 64, 1, 16, skip_empty=True)
+        self.rank_color = rank_colors.get(rank, (255, 255, 255))  # White as default
+        self.label = f'Rank {rank}  {name}'
+
+
+_archetypes = {}
+
+
+def get_archetype(kind, name, rank):
+    key = (kind, name, rank)
+    archetype = _archetypes.get(key)
+    if archetype is None:
+        archetype = _archetypes[key] = Archetype(kind, name, rank)
+    return archetype
+
+
+def archetype_count():
+    return len(_archetypes)
@@ -0,0 +1,124 @@
+import pygame
+
+# Process-wide cache of decoded sprite sheets.
+# The frame lists are shared read-only: copy a frame before modifying it.
+_spritesheet_cache = {}
+_image_cache = {}
+_rotation_cache = {}
+_mask_cache = {}
+_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def is_sprite_empty(sprite):
+    """Verifica se o sprite é vazio (transparente)"""
+    return sprite.get_bounding_rect(min_alpha=1).width == 0
+
+
+def _slice_spritesheet(image_path, sprite_width, sprite_height, rows, columns, skip_empty):
+    sheet = pygame.image.load(image_path).convert_alpha()
+    sheet_width, sheet_height = sheet.get_size()
+    sprites = []
+
+    for row in range(rows):
+        row_sprites = []
+        for col in range(columns):
+            rect = pygame.Rect(col * sprite_width, row * sprite_height, sprite_width, sprite_height)
+            if rect.right <= sheet_width and rect.bottom <= sheet_height:
+                sprite = sheet.subsurface(rect).copy()
+                if not skip_empty or not is_sprite_empty(sprite):
+                    row_sprites.append(sprite)
+        if row_sprites or not skip_empty:
+            sprites.append(row_sprites)
+
+    return sprites
+
+
+def load_spritesheet(image_path, sprite_width, sprite_height, rows, columns, skip_empty=False):
+    """Return the frames of a sprite sheet, decoding the file only on the first call.
+
+    With skip_empty=True fully transparent frames (and empty rows) are dropped.
+    """
+    key = (image_path, sprite_width, sprite_height, rows, columns, skip_empty)
+    sprites = _spritesheet_cache.get(key)
+    if sprites is None:
+        _cache_stats['misses'] += 1
+        sprites = _slice_spritesheet(image_path, sprite_width, sprite_height, rows, columns, skip_empty)
+        _spritesheet_cache[key] = sprites
+    else:
+        _cache_stats['hits'] += 1
+    return sprites
+
+
+def load_spritesheet_masks(image_path, sprite_width, sprite_height, rows, columns, skip_empty=False):
+    """Masks laid out like load_spritesheet() with the same arguments: masks[row][col] is the
+    mask of frame [row][col], so animations can swap image and mask together.
+    """
+    key = (image_path, sprite_width, sprite_height, rows, columns, skip_empty)
+    masks = _mask_cache.get(key)
+    if masks is None:
+        sprites = load_spritesheet(image_path, sprite_width, sprite_height, rows, columns, skip_empty)
+        masks = [[pygame.mask.from_surface(frame) for frame in row] for row in sprites]
+        _mask_cache[key] = masks
+    return masks
+
+
+def load_image(image_path):
+    """Return a shared (surface, mask) pair for a single image, keyed by path.
+
+    Every Tile with the same image points at the same Surface and Mask.
+    """
+    entry = _image_cache.get(image_path)
+    if entry is None:
+        _cache_stats['misses'] += 1
+        image = pygame.image.load(image_path).convert_alpha()
+        entry = (image, pygame.mask.from_surface(image))
+        _image_cache[image_path] = entry
+    else:
+        _cache_stats['hits'] += 1
+    return entry
+
+
+def load_rotation_atlas(image_path, steps):
+    """Return `steps` (surface, mask) pairs of the image rotated in equal angle increments.
+
+    Frame i is the image rotated by i * 360 / steps degrees (counter-clockwise).
+    """
+    key = (image_path, steps)
+    atlas = _rotation_cache.get(key)
+    if atlas is None:
+        _cache_stats['misses'] += 1
+        original, _ = load_image(image_path)
+        atlas = []
+        for i in range(steps):
+            image = pygame.transform.rotate(original, i * 360 / steps)
+            atlas.append((image, pygame.mask.from_surface(image)))
+        _rotation_cache[key] = atlas
+    else:
+        _cache_stats['hits'] += 1
+    return atlas
+
+
+def rotation_index(angle, steps):
+    """Index of the atlas frame closest to `angle` (degrees)."""
+    return int(round((angle % 360) * steps / 360)) % steps
+
+
+def cache_stats():
+    """Hit/miss counters, used to confirm that combat no longer reads from disk."""
+    return {
+        'hits': _cache_stats['hits'],
+        'misses': _cache_stats['misses'],
+        'spritesheets': len(_spritesheet_cache),
+        'images': len(_image_cache),
+        'rotation_atlases': len(_rotation_cache),
+        'mask_sheets': len(_mask_cache),
+    }
+
+
+def clear_cache():
+    _spritesheet_cache.clear()
+    _image_cache.clear()
+    _rotation_cache.clear()
+    _mask_cache.clear()
+    _cache_stats['hits'] = 0
+    _cache_stats['misses'] = 0
@@ -0,0 +1,90 @@
+import random
+import pygame
+from settings import *
+
+
+class SoundBank:
+    """Every entry of sound_data decoded once, played on a pool of reserved mixer channels.
+
+    An entry may be one path or a list of variants (one is picked at random per play).
+    Missing files are skipped with a message. play(name) respects the entry's limits
+    from sound_limits: at most `voices` copies sounding at once and at least
+    `interval` ms between two starts; a play over the limit is simply dropped. When
+    every channel of the pool is busy the one started longest ago is reused.
+    """
+
+    def __init__(self, data, channels=SOUND_CHANNELS, limits=None):
+        self.sounds = {}
+        self.limits = limits if limits is not None else sound_limits
+        self.last_played = {}
+        self.voices = {}  # nome -> canais tocando esse som
+        self.played = 0
+        self.dropped = 0
+        self.channels = []
+        self.started = []
+        if not pygame.mixer.get_init():
+            print("Mixer not initialised: sounds disabled")
+            return
+        if pygame.mixer.get_num_channels() < channels:
+            pygame.mixer.set_num_channels(channels)
+        # Canais reservados: Sound.play() solto (sem canal) nunca os rouba
+        pygame.mixer.set_reserved(channels)
+        self.channels = [pygame.mixer.Channel(index) for index in range(channels)]
+        self.started = [0] * channels
+        for name, paths in data.items():
+            variants = []
+            for path in paths if isinstance(paths, list) else [paths]:
+                try:
+                    variants.append(pygame.mixer.Sound(path))
+                except (pygame.error, FileNotFoundError) as error:
+                    print(f"Skipping sound {path}: {error}")
+            if variants:
+                self.sounds[name] = variants
+
+    def limit(self, name):
+        return self.limits.get(name, self.limits['default'])
+
+    def play(self, name):
+        variants = self.sounds.get(name)
+        if not variants:
+            return None
+        now = pygame.time.get_ticks()
+        voices, interval = self.limit(name)
+        last = self.last_played.get(name)
+        playing = [channel for channel in self.voices.get(name, ()) if channel.get_busy() and channel.get_sound() in variants]
+        self.voices[name] = playing
+        if (last is not None and now - last < interval) or len(playing) >= voices:
+            self.dropped += 1
+            return None
+        index = self.free_channel()
+        channel = self.channels[index]
+        channel.play(random.choice(variants))
+        self.started[index] = now
+        self.last_played[name] = now
+        playing.append(channel)
+        self.played += 1
+        return channel
+
+    def free_channel(self):
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+        return min(range(len(self.channels)), key=self.started.__getitem__)
+
+    def stats(self):
+        return {'sounds': len(self.sounds), 'played': self.played, 'dropped': self.dropped}
+
+
+_bank = None
+
+
+def load_sounds():
+    """Decodifica sound_data uma vez (no início do jogo); as chamadas seguintes reaproveitam o banco."""
+    global _bank
+    if _bank is None:
+        _bank = SoundBank(sound_data)
+    return _bank
+
+
+def play_sound(name):
+    return load_sounds().play(name)
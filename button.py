@@ -1,11 +1,12 @@
 import pygame
+from text_display import get_font, render_text
 
 class Button:
     def __init__(self, x, y, width, height, text, color_scheme='blue'):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.color_scheme = color_scheme
-        self.font = pygame.font.Font(None, 32)
+        self.font = get_font(None, 32)
         
         self.color_schemes = {
             'blue': {
@@ -38,7 +39,7 @@ class Button:
         pygame.draw.rect(surface, color, self.rect, border_radius=10)
         pygame.draw.rect(surface, self.color_schemes[self.color_scheme]['text'], self.rect, 2, border_radius=10)
         
-        text_surf = self.font.render(self.text, True, self.color_schemes[self.color_scheme]['text'])
+        text_surf = render_text(self.text, 32, self.color_schemes[self.color_scheme]['text'])
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
         
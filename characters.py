@@ -8,32 +8,7 @@ from effects import *
 from text_display import FloatingText
 from ItemDrop import ItemDrop
 from tile import Tile
-
-def load_spritesheet(image_path, sprite_width, sprite_height, rows, columns):
-    sheet = pygame.image.load(image_path).convert_alpha()
-    sheet_width, sheet_height = sheet.get_size()
-    sprites = []
-
-    for row in range(rows):
-        row_sprites = []
-        for col in range(columns):
-            rect = pygame.Rect(col * sprite_width, row * sprite_height, sprite_width, sprite_height)
-            if rect.right <= sheet_width and rect.bottom <= sheet_height:
-                sprite = sheet.subsurface(rect).copy()
-                if not is_sprite_empty(sprite):
-                    row_sprites.append(sprite)
-        if row_sprites:
-            sprites.append(row_sprites)
-
-    return sprites
-
-def is_sprite_empty(sprite):
-    """Verifica se o sprite é vazio (transparente)"""
-    for x in range(sprite.get_width()):
-        for y in range(sprite.get_height()):
-            if sprite.get_at((x, y)).a != 0:
-                return False
-    return True
+from assets import load_spritesheet
 
 class Character(pygame.sprite.Sprite):
     RANK_MULTIPLIERS = {
@@ -214,36 +189,23 @@ class Character(pygame.sprite.Sprite):
                 return
   
     def find_closest_enemy(self):
+        proximity = self.level.proximity
         closest_enemy = None
-        closest_distance = self.vision_radius
-        
+
         if isinstance(self, Ally):  # If the character is an Ally
-            # Check enemies
-            for enemy in self.level.enemies:
-                distance = pygame.math.Vector2(enemy.rect.center).distance_to(pygame.math.Vector2(self.rect.center))
-                if distance < closest_distance:
-                    closest_distance = distance
-                    closest_enemy = enemy
-            
+            closest_enemy = proximity.nearest(self.rect.center, 'enemies', self.vision_radius)
+            closest_distance = self.vision_radius
+            if closest_enemy is not None:
+                closest_distance = pygame.math.Vector2(closest_enemy.rect.center).distance_to(self.rect.center)
+
             # Check player (assuming player is also an enemy for allies)
             player_distance = pygame.math.Vector2(self.level.player.rect.center).distance_to(pygame.math.Vector2(self.rect.center))
             if player_distance < closest_distance:
-                closest_distance = player_distance
                 closest_enemy = self.level.player
 
         elif isinstance(self, Enemy):  # If the character is an Enemy
-            # Check allies
-            for ally in self.level.allies:
-                distance = pygame.math.Vector2(ally.rect.center).distance_to(pygame.math.Vector2(self.rect.center))
-                if distance < closest_distance:
-                    closest_distance = distance
-                    closest_enemy = ally
-            
-            # Check player
-            player_distance = pygame.math.Vector2(self.level.player.rect.center).distance_to(pygame.math.Vector2(self.rect.center))
-            if player_distance < closest_distance:
-                closest_distance = player_distance
-                closest_enemy = self.level.player
+            # Allies and player
+            closest_enemy = proximity.nearest(self.rect.center, 'friends', self.vision_radius, exclude=self)
 
         self.target = closest_enemy
         return closest_enemy
@@ -389,7 +351,7 @@ class Ally(Character):
         if not data:
             raise ValueError(f"Ally data for '{self.name}' not found.")
         self.name = name
-        self.sprites = load_spritesheet(data['graphic'], 64, 64, 4, 4)
+        self.sprites = load_spritesheet(data['graphic'], 64, 64, 4, 4, skip_empty=True)
         self.current_sprite = 0
         self.image = self.sprites[0][self.current_sprite]
         self.rect = self.image.get_rect(center=pos)
@@ -401,7 +363,7 @@ class Ally(Character):
     def initialize_sprites(self):
         
         
-        self.sprites = load_spritesheet(self.data['graphic'], 64, 64, 4, 4)
+        self.sprites = load_spritesheet(self.data['graphic'], 64, 64, 4, 4, skip_empty=True)
         self.current_sprite = 0
         self.image = self.sprites[0][self.current_sprite]
         self.rect = self.image.get_rect(center=self.pos)
@@ -461,7 +423,7 @@ class Enemy(Character):
 
     def initialize_sprites(self):
         # Enemy-specific sprite initialization
-        self.sprites = load_spritesheet(self.data['graphic'], 64, 64, 4, 4)
+        self.sprites = load_spritesheet(self.data['graphic'], 64, 64, 4, 4, skip_empty=True)
         self.current_sprite = 0
         self.image = self.sprites[0][self.current_sprite]
         self.rect = self.image.get_rect(center=self.pos)
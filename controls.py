@@ -0,0 +1,79 @@
+import random
+import pygame
+from event_bus import events, KEYDOWN
+
+
+class KeyboardControls:
+    """Fonte de input padrão: o teclado de verdade."""
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+    def step(self, tick):
+        pass
+
+
+class HeldKeys:
+    """Mimics the ScancodeWrapper returned by pygame.key.get_pressed()."""
+
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class ScriptedControls:
+    """Input without a keyboard, for headless runs.
+
+    `script` maps a tick number to (held_keys, pressed_keys): from that tick on the
+    held keys are reported by get_pressed(), and each pressed key is sent once
+    on the event bus, like a KEYDOWN event in Game.playing. With no script
+    nothing is ever pressed.
+    """
+
+    def __init__(self, script=None):
+        self.script = script or {}
+        self.held = HeldKeys()
+
+    def get_pressed(self):
+        return self.held
+
+    def step(self, tick):
+        entry = self.script.get(tick)
+        if entry is None:
+            return
+        held, pressed = entry
+        self.held = HeldKeys(held)
+        for key in pressed:
+            events.publish(KEYDOWN, key)
+
+
+class RandomControls(ScriptedControls):
+    """Jogador 'macaco': anda, corre, pula e ataca ao acaso, reproduzível pela seed."""
+
+    MOVES = (pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s)
+    ACTIONS = (pygame.K_j, pygame.K_j, pygame.K_SPACE, pygame.K_k)
+
+    def __init__(self, seed=0, hold_ticks=30):
+        super().__init__()
+        self.random = random.Random(seed)
+        self.hold_ticks = hold_ticks
+
+    def step(self, tick):
+        if tick % self.hold_ticks:
+            return
+        held = set()
+        if self.random.random() < 0.8:
+            held.add(self.random.choice(self.MOVES))
+            if self.random.random() < 0.3:
+                held.add(pygame.K_LSHIFT)
+        pressed = []
+        if self.random.random() < 0.5:
+            key = self.random.choice(self.ACTIONS)
+            pressed.append(key)
+            if key == pygame.K_k:
+                held.add(pygame.K_k)  # segura o carregamento até a próxima troca
+        self.held = HeldKeys(held)
+        for key in pressed:
+            events.publish(KEYDOWN, key)
@@ -2,6 +2,11 @@ import pygame
 from settings import *
 import random
 from tile import Tile
+from assets import load_spritesheet
+from particles import emit_particle, emit_trail, emit_smoke, emit_ember, emit_water
+from lighting import add_light
+from pooling import Pool, Pooled
+import audio
 import math
 import numpy as np
 # Remove the following line:
@@ -11,27 +16,9 @@ import numpy as np
 def simple_noise(x, y):
     return random.uniform(0, 1)
 
-def load_spritesheet(image_path, sprite_width, sprite_height, rows, columns):
-    sheet = pygame.image.load(image_path).convert_alpha()
-    sheet_width, sheet_height = sheet.get_size()
-    sprites = []
-
-    for row in range(rows):
-        row_sprites = []
-        for col in range(columns):
-            rect = pygame.Rect(col * sprite_width, row * sprite_height, sprite_width, sprite_height)
-            if rect.right <= sheet_width and rect.bottom <= sheet_height:
-                sprite = sheet.subsurface(rect).copy()
-                row_sprites.append(sprite)
-        sprites.append(row_sprites)
-
-    return sprites
 def play_sound(effect_type):
-    sound_path = sound_data.get(effect_type)
-    if isinstance(sound_path, list):
-        sound_path = random.choice(sound_path)
-    sound = pygame.mixer.Sound(sound_path)
-    sound.play()
+    # Som já decodificado no SoundBank (audio.py), com limite de vozes e de repetição
+    audio.play_sound(effect_type)
 import pygame
 
 class MeleeEffect(pygame.sprite.Sprite):
@@ -83,56 +70,10 @@ class MeleeEffect(pygame.sprite.Sprite):
             movement = self.direction * self.speed * dt
             self.pos += movement
             self.rect.center = self.pos
-class BloodParticle(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, velocity=None):
-        super().__init__(groups)
-        self.radius = 3  # Start with a small radius
-        self.image = pygame.Surface((3, 3), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (200, 0, 0), (1.5, 1.5), self.radius)
-        self.rect = self.image.get_rect(center=pos)
-        self.pos = pygame.math.Vector2(pos)
-        self.velocity = velocity or pygame.math.Vector2(random.uniform(-1, 1), random.uniform(-2, 0))
-        self.gravity = pygame.math.Vector2(0.5, 0.5)  # 45-degree fall
-        self.alpha = 255
-        self.fade_speed = random.uniform(0.5, 1)
-        self.stopped = False
-        self.stop_time = random.uniform(0.2, 0.5)  # Time before stopping
-        self.time_alive = 0
-        self.grow_speed = random.uniform(0.5, 1)
-        self.max_radius = random.uniform(3, 5)
-
-    def update(self, dt):
-        self.time_alive += dt
-        if not self.stopped:
-            self.velocity += self.gravity * dt
-            self.pos += self.velocity * dt
-            self.rect.center = (round(self.pos.x), round(self.pos.y))
-            
-            if self.time_alive >= self.stop_time:
-                self.stopped = True
-        else:
-            # Grow the particle
-            if self.radius < self.max_radius:
-                self.radius += self.grow_speed * dt
-                self.redraw()
-            
-            # Start fading after growing
-            if self.radius >= self.max_radius:
-                self.alpha -= self.fade_speed
-                if self.alpha <= 0:
-                    self.kill()
-                else:
-                    self.image.set_alpha(int(self.alpha))
-
-    def redraw(self):
-        size = math.ceil(self.radius * 2)
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (200, 0, 0), (size // 2, size // 2), self.radius)
-        self.rect = self.image.get_rect(center=self.rect.center)
-
 class RainParticle(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, screen_width, screen_height, lifespan=2000, wind_direction=pygame.math.Vector2(0, 0), wind_speed=0):
+    def __init__(self, pos, groups, screen_width, screen_height, lifespan=2000, wind_direction=pygame.math.Vector2(0, 0), wind_speed=0, trails=None):
         super().__init__(groups)
+        self.trails = trails  # ParticleSystem em coordenadas de tela (ver WeatherController)
         self.image = pygame.Surface((2, 2), pygame.SRCALPHA)
         self.image.fill((80, 100, 200, 150))
         self.rect = self.image.get_rect(center=pos)
@@ -160,7 +101,8 @@ class RainParticle(pygame.sprite.Sprite):
         self.trail_timer += dt
         if self.trail_timer >= self.trail_interval:
             self.trail_timer = 0
-            ParticleTrail(self.rect.center, self.groups(), (80, 100, 200), initial_size=3, lifespan=200)
+            if self.trails is not None:
+                self.trails.emit_trail(self.rect.center, (80, 100, 200), initial_size=3, lifespan=200)
 
     def is_on_screen(self):
         return 0 <= self.rect.top < self.screen_height and 0 <= self.rect.left < self.screen_width
@@ -203,18 +145,21 @@ class Particle2(pygame.sprite.Sprite):
 
 
 
-class Spark(pygame.sprite.Sprite):
+class Spark(Pooled, pygame.sprite.Sprite):
     def __init__(self, pos, groups):
+        super().__init__()
+        self.sprites = load_spritesheet('images/effects/spark.png', 32, 32, 1, 4)[0]  # Ajusta para obter a primeira linha de sprites
+        self.animation_time = 0.1
+        self.reset(pos, groups)
+
+    def reset(self, pos, groups):
         if not isinstance(groups, (list, tuple)):
             groups = [groups]
-        super().__init__(groups)
-        self.sprites = load_spritesheet('images/effects/spark.png', 32, 32, 1, 4)[0]  # Ajusta para obter a primeira linha de sprites
         self.current_sprite = 0
         self.image = self.sprites[self.current_sprite]
         self.rect = self.image.get_rect(center=pos)
-        self.animation_time = 0.1
         self.current_time = 0
-        
+        self.add(*groups)
 
     def update(self, dt):
         self.current_time += dt
@@ -225,12 +170,18 @@ class Spark(pygame.sprite.Sprite):
             if self.current_sprite == len(self.sprites) - 1:
                 self.kill()
 
-class Puff(pygame.sprite.Sprite):
+Spark.pool = Pool(Spark, capacity=64)
+
+class Puff(Pooled, pygame.sprite.Sprite):
     def __init__(self, pos, groups):
+        super().__init__()
+        self.sprites = load_spritesheet('images/effects/puff.png', 64, 64, 1, 9)[0]  # Ajusta para obter a primeira linha de sprites
+        self.animation_time = 0.1
+        self.reset(pos, groups)
+
+    def reset(self, pos, groups):
         if not isinstance(groups, (list, tuple)):
             groups = [groups]
-        super().__init__(groups)
-        self.sprites = load_spritesheet('images/effects/puff.png', 64, 64, 1, 9)[0]  # Ajusta para obter a primeira linha de sprites
         self.current_sprite = 0
         self.image = self.sprites[self.current_sprite]
         
@@ -239,8 +190,8 @@ class Puff(pygame.sprite.Sprite):
         else:
             raise ValueError("Position must be a tuple with 2 elements (x, y).")
         
-        self.animation_time = 0.1
         self.current_time = 0
+        self.add(*groups)
 
     def update(self, dt):
         self.current_time += dt
@@ -250,6 +201,9 @@ class Puff(pygame.sprite.Sprite):
             self.image = self.sprites[self.current_sprite]
             if self.current_sprite == len(self.sprites) - 1:
                 self.kill()
+
+Puff.pool = Pool(Puff, capacity=32)
+
 class Kawarimi(pygame.sprite.Sprite):
     def __init__(self, pos, groups, all_sprites, tiles):
         super().__init__(groups)
@@ -291,7 +245,7 @@ class BloodHit(pygame.sprite.Sprite):
 
     def create_particles(self):
         for _ in range(20):  # Ajuste o número de partículas conforme necessário
-            Particle(self.pos, self.groups, initial_size=8, lifespan=1000, color=(255, 0, 0))
+            emit_particle(self.pos, initial_size=8, lifespan=1000, color=(255, 0, 0))
 
 
 class ElectricAura(pygame.sprite.Sprite):
@@ -318,11 +272,7 @@ class ElectricAura(pygame.sprite.Sprite):
         # Cria um rastro de partículas amarelas
         #FireWork(self.rect.center, self.groups, initial_size=20, lifespan=1000, num_particles=40)
         
-        if not isinstance(self.groups, (list, tuple)):
-            groups = [self.groups]
-        else:
-            groups = self.groups
-        ParticleTrail(self.rect.center, groups, color=(200, 200, 250), initial_size=10, lifespan=2000)                        
+        emit_trail(self.rect.center, color=(200, 200, 250), initial_size=10, lifespan=2000)                        
         
 
     def update(self, dt):
@@ -399,17 +349,21 @@ class Slash(pygame.sprite.Sprite):
         if self.current_sprite == len(self.sprites) - 1:
             self.kill()
             
-class Explosion(pygame.sprite.Sprite):
+class Explosion(Pooled, pygame.sprite.Sprite):
     def __init__(self, pos, groups):
+        super().__init__()
+        self.sprites = load_spritesheet('images/effects/explosion.png', 96, 96, 1, 24)[0]  # Ajusta para obter a primeira linha de sprites
+        self.animation_time = 0.04
+        self.reset(pos, groups)
+
+    def reset(self, pos, groups):
         if not isinstance(groups, (list, tuple)):
             groups = [groups]
-        super().__init__(groups)
-        self.sprites = load_spritesheet('images/effects/explosion.png', 96, 96, 1, 24)[0]  # Ajusta para obter a primeira linha de sprites
         self.current_sprite = 0
         self.image = self.sprites[self.current_sprite]
         self.rect = self.image.get_rect(center=pos)
-        self.animation_time = 0.04
         self.current_time = 0
+        self.add(*groups)
 
     def update(self, dt):
         self.current_time += dt
@@ -420,101 +374,9 @@ class Explosion(pygame.sprite.Sprite):
             if self.current_sprite == len(self.sprites) - 1:
                 self.kill()
 
+Explosion.pool = Pool(Explosion, capacity=32)
 
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, color=(255, 255, 255), initial_size=10, lifespan=1000, wind_direction=pygame.math.Vector2(0, 0), wind_speed=0):
-        if not isinstance(groups, (list, tuple)):
-            groups = [groups]
-        super().__init__(groups)
-        self.initial_size = initial_size
-        self.lifespan = lifespan
-        self.start_time = pygame.time.get_ticks()
-        self.image = pygame.Surface((initial_size, initial_size), pygame.SRCALPHA)
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=pos)
-        self.alpha = 255  # Initial transparency
-        self.color = color
-        
-        # Velocidade inicial aleatória para a explosão
-        self.velocity = pygame.math.Vector2(random.uniform(-1, -3), random.uniform(-1, -3)) * 1
-
-        self.gravity = pygame.math.Vector2(0.05, 0.05)  # Gravidade aplicada nas partículas
-        self.wind_direction = wind_direction
-        self.wind_speed = wind_speed
-    
-
-
-    def update(self, dt):
-        # Calculate the elapsed time
-        elapsed_time = pygame.time.get_ticks() - self.start_time
-
-        # Update position with velocity and gravity
-        self.velocity += self.gravity
-        self.rect.x += self.wind_direction.x * self.wind_speed * dt + self.velocity.x
-        self.rect.y += self.wind_direction.y * self.wind_speed * dt + self.velocity.y
-
-
-        # Calculate the new size and alpha
-        if elapsed_time < self.lifespan:
-            size_factor = 1 - (elapsed_time / self.lifespan)
-            new_size = max(1, int(self.initial_size * size_factor))
-            self.alpha = int(255 * size_factor/size_factor)
-            
-            # Calculate the new color (interpolating from yellow to black)
-            red =   self.color[0] * size_factor
-            green = self.color[1] * size_factor
-            blue =  self.color[2] * size_factor
-
-            # Update the image size, color, and alpha
-          
-            self.image = pygame.Surface((new_size, new_size), pygame.SRCALPHA)
-            pygame.draw.circle(self.image, (red, green, blue, self.alpha), (new_size // 2, new_size // 2), new_size // 2)
-            self.rect = self.image.get_rect(center=self.rect.center)
-        else:
-            self.kill()
-
-class FireSmoke(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, color, initial_size=7, lifespan=5000):
-        super().__init__(groups)
-        self.initial_size = initial_size
-        self.lifespan = lifespan
-        self.start_time = pygame.time.get_ticks()
-        self.image = pygame.Surface((initial_size, initial_size), pygame.SRCALPHA)
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=pos)
-        self.alpha = 200  # Initial transparency
-        self.color = color
-        
-        # Velocidade inicial aleatória para a explosão
-        self.velocity = pygame.math.Vector2(random.uniform(-3, -4), random.uniform(-3, -4))
 
-    def update(self, dt):
-        # Calculate the elapsed time
-        elapsed_time = pygame.time.get_ticks() - self.start_time
-
-        
-
-        # Calculate the new size and alpha
-        if elapsed_time < self.lifespan:
-            size_factor = elapsed_time / self.lifespan
-            new_size = int(self.initial_size * (1 + size_factor))
-            self.alpha = int(200 * (1 - size_factor))
-            
-            # Calculate the new color (interpolating from the initial color to black)
-            red = self.color[0] *   (1 - size_factor)
-            green = self.color[1] * (1 - size_factor)
-            blue = self.color[2] *  (1 - size_factor)
-            # Update position with velocity and gravity
-            self.rect.x += self.velocity.x* (1 + size_factor)*0.3
-            self.rect.y += self.velocity.y* (1 + size_factor)*0.3
-
-            # Update the image size, color, and alpha
-            self.image = pygame.Surface((new_size, new_size), pygame.SRCALPHA)
-            pygame.draw.circle(self.image, (red, green, blue, self.alpha), (new_size // 2, new_size // 2), new_size // 2)
-            self.rect = self.image.get_rect(center=self.rect.center)
-            
-        else:
-            self.kill()
 class SmokeEmitter(pygame.sprite.Sprite):
     def __init__(self, pos, groups, color, initial_size=7, particle_lifespan=2000, emission_duration=10000, emission_interval=150):
         if not isinstance(groups, (list, tuple)):
@@ -537,43 +399,13 @@ class SmokeEmitter(pygame.sprite.Sprite):
 
         if elapsed_time < self.emission_duration:
             if current_time - self.last_emission_time >= self.emission_interval:
-                FireSmoke(self.pos, self.groups, self.color, self.initial_size, self.particle_lifespan)
+                emit_smoke(self.pos, self.color, self.initial_size, self.particle_lifespan)
                 self.last_emission_time = current_time
         else:
             self.kill()
 
 
 
-class FireRemains(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, area_size=30, initial_size=3, lifespan=1000):
-        if not isinstance(groups, (list, tuple)):
-            groups = [groups]
-        super().__init__(groups)
-        self.pos = pos
-        self.area_size = area_size
-        self.initial_size = initial_size
-        self.lifespan = lifespan
-        self.start_time = pygame.time.get_ticks()
-        self.color = random.choice([(255, 255, 0), (255, 100, 0), (255, 165, 0)])  # Amarelo, vermelho, laranja
-        self.image = pygame.Surface((initial_size, initial_size), pygame.SRCALPHA)
-        self.image.fill(self.color)
-        self.rect = self.image.get_rect(center=pos)
-
-        self.alpha = 200  # Initial transparency
-
-    def update(self, dt):
-        elapsed_time = pygame.time.get_ticks() - self.start_time
-
-        if elapsed_time < self.lifespan:
-            alpha_factor = 1 - (elapsed_time / self.lifespan)
-            self.alpha = int(200 * alpha_factor)
-            self.rect.x -= 1
-            self.rect.y -= 1
-            self.image.fill((*self.color, self.alpha))
-        else:
-            self.kill()
-
-
 class FireWork(pygame.sprite.Sprite):
     def __init__(self, pos, groups, num_particles=30, initial_size=5, lifespan=2000):
         if not isinstance(groups, (list, tuple)):
@@ -627,6 +459,7 @@ class FireEmitter(pygame.sprite.Sprite):
         if not isinstance(groups, (list, tuple)):
             groups = [groups]
         super().__init__(groups)
+        add_light(self, 60, (255, 180, 80))
         self.pos = pos
         self.groups = groups
         self.area_size = area_size
@@ -654,15 +487,12 @@ class FireEmitter(pygame.sprite.Sprite):
             offset_x = random.randint(-self.area_size // 2, self.area_size // 2)
             offset_y = random.randint(-self.area_size // 2, self.area_size // 2)
             pos = (self.pos[0] + offset_x, self.pos[1] + offset_y)
-            if not isinstance(self.groups, (list, tuple)):
-                groups = [self.groups]
-            else:
-                groups = self.groups
-            particle = FireRemains(pos, groups, color)
+            emit_ember(pos, color)
 
 class Bonfire(pygame.sprite.Sprite):
     def __init__(self, pos, groups):
         super().__init__(groups)
+        add_light(self, 120, (255, 200, 100))
         self.sprites = load_spritesheet('images/effects/bonfire.png', 32, 32, 1, 4)[0]  # Ajuste o caminho da imagem e o tamanho dos sprites
         self.current_sprite = 0
         self.image = self.sprites[self.current_sprite]
@@ -678,75 +508,6 @@ class Bonfire(pygame.sprite.Sprite):
             self.image = self.sprites[self.current_sprite]
             
             
-class ParticleTrail(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, color, initial_size=6, lifespan=700):
-        super().__init__(groups)
-        self.initial_size = initial_size
-        self.lifespan = lifespan
-        self.start_time = pygame.time.get_ticks()
-        self.image = pygame.Surface((initial_size, initial_size), pygame.SRCALPHA)
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=pos)
-        self.alpha = 255
-        self.color = color
-
-    def update(self, dt):
-        elapsed_time = pygame.time.get_ticks() - self.start_time
-        size_factor = 1 - (elapsed_time / self.lifespan)
-        new_size = max(1, int(self.initial_size * size_factor))
-        self.alpha = int(255 * size_factor)
-        
-        if elapsed_time < self.lifespan:
-            self.image = pygame.Surface((new_size, new_size), pygame.SRCALPHA)
-            self.image.set_alpha(self.alpha)
-            pygame.draw.circle(self.image, self.color, (new_size // 2, new_size // 2), new_size // 2)
-            self.rect = self.image.get_rect(center=self.rect.center)
-        else:
-            self.kill()
-class WaterParticle(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, initial_size=3, lifespan=1000):
-        super().__init__(groups)
-        self.initial_size = initial_size
-        self.lifespan = lifespan
-        self.start_time = pygame.time.get_ticks()
-        self.image = pygame.Surface((initial_size, initial_size), pygame.SRCALPHA)
-        # Randomly choose a shade of blue
-        # Define the shades of blue
-        self.blue_shades = [(100, 100, 250), (50, 100, 250), (50, 150, 250), (50, 180, 250)]
-        # Randomly choose a starting color index
-        self.color_index = random.randint(0, len(self.blue_shades) - 1)
-        self.image.fill(self.color_index)
-        self.rect = self.image.get_rect(center=(pos[0] + random.uniform(-1, 5), pos[1] + random.uniform(-15, 15)))
-        self.alpha = 255  # Initial transparency
-        self.gravity = 0  #pygame.math.Vector2(0, 0.1)
-        self.velocity = pygame.math.Vector2(0, random.uniform(1, 2))
-
-    def update(self, dt):
-        # Calculate the elapsed time
-        elapsed_time = pygame.time.get_ticks() - self.start_time
-
-        # Update position with velocity and gravity
-        self.rect.y += self.velocity.y
-        
-        
-
-        # Calculate the new size and alpha
-        if elapsed_time < self.lifespan:
-            size_factor = 1 - (elapsed_time / self.lifespan)
-            new_size = max(1, int(self.initial_size * size_factor))
-            self.alpha = int(200 )
-            
-            # Update the color index based on elapsed time
-            color_progress = int(elapsed_time / (self.lifespan / len(self.blue_shades)))
-            current_color = self.blue_shades[(self.color_index + color_progress) % len(self.blue_shades)]
-
-            # Update the image size, color, and alpha
-           # self.image = pygame.Surface((new_size, new_size), pygame.SRCALPHA)
-            self.image.fill((*current_color, self.alpha))
-            self.rect = self.image.get_rect(center=self.rect.center)
-
-        else:
-            self.kill()
 class WaterEmitter2:
     def __init__(self, pos, direction, groups, speed=1, particle_count=10, lifespan=1000):
         self.pos = pos
@@ -794,7 +555,7 @@ class WaterEmitter(pygame.sprite.Sprite):
         current_time = pygame.time.get_ticks()
         if current_time - self.last_emit_time >= self.emission_interval:
             self.last_emit_time = current_time
-            WaterParticle(self.rect.center, self.groups)
+            emit_water(self.rect.center)
 
 class WaterLoad(pygame.sprite.Sprite):
     def __init__(self, pos, direction, target_pos, groups, speed=1, lifespan=1000):
@@ -822,11 +583,14 @@ class WaterLoad(pygame.sprite.Sprite):
                 self.groups[0].player.water_mass += 1
                 self.groups[0].player.water_particles.remove(self)
 
-class InsectSwarm(pygame.sprite.Sprite):
+class InsectSwarm(Pooled, pygame.sprite.Sprite):
     def __init__(self, pos, user, target, groups, level, speed=200, lifespan=6000):
-        super().__init__(groups)
+        super().__init__()
         self.image = pygame.Surface((2, 2))
         self.image.fill((5, 5, 0))                        # cor
+        self.reset(pos, user, target, groups, level, speed, lifespan)
+
+    def reset(self, pos, user, target, groups, level, speed=200, lifespan=6000):
         self.rect = self.image.get_rect(center=pos)
         self.user = user
         self.target = target
@@ -846,6 +610,7 @@ class InsectSwarm(pygame.sprite.Sprite):
         self.moving_to_target = True
         self.circling_target = False
         self.returning_to_user = False
+        self.add(*groups)
 
     def update(self, dt):
         elapsed_time = pygame.time.get_ticks() - self.start_time
@@ -906,6 +671,9 @@ class InsectSwarm(pygame.sprite.Sprite):
             direction.normalize_ip()
             self.rect.x += direction.x * self.speed * dt
             self.rect.y += direction.y * self.speed * dt
+
+InsectSwarm.pool = Pool(InsectSwarm, capacity=128)
+
 from pygame.locals import BLEND_RGB_ADD
 
 class NinjutsuEffect(pygame.sprite.Sprite):
@@ -937,7 +705,7 @@ class FireballEffect(NinjutsuEffect):
         super().update(dt)
         self.pos += self.direction * self.speed * dt
         self.rect.center = self.pos
-        Particle(self.rect.center, self.groups, color=(255, 100, 0), initial_size=5, lifespan=500)
+        emit_particle(self.rect.center, color=(255, 100, 0), initial_size=5, lifespan=500)
 
 
 class PhoenixFlowerEffect(NinjutsuEffect):
@@ -969,7 +737,7 @@ class WaterBulletEffect(NinjutsuEffect):
         super().update(dt)
         self.pos += self.direction * self.speed * dt
         self.rect.center = self.pos
-        Particle(self.rect.center, self.groups, color=(0, 100, 255), initial_size=3, lifespan=300)
+        emit_particle(self.rect.center, color=(0, 100, 255), initial_size=3, lifespan=300)
 
 class WaterDragonEffect(NinjutsuEffect):
     def __init__(self, pos, groups, target_pos):
@@ -980,20 +748,13 @@ class WaterDragonEffect(NinjutsuEffect):
         self.image = pygame.Surface((20, 20), pygame.SRCALPHA)
         pygame.draw.circle(self.image, (0, 100, 255), (10, 10), 10)
         self.rect = self.image.get_rect(center=pos)
-        self.particles = []
 
     def update(self, dt):
         super().update(dt)
         self.t = min(1, self.t + dt * 0.001)
         current_pos = self.bezier(self.t, self.control_points)
         self.rect.center = current_pos
-        new_particle = Particle(current_pos, self.groups, color=(0, 100, 255), initial_size=10, lifespan=500)
-        self.particles.append(new_particle)
-        
-        for particle in self.particles[:]:
-            particle.update(dt)
-            if particle.alpha <= 0:
-                self.particles.remove(particle)
+        emit_particle(current_pos, color=(0, 100, 255), initial_size=10, lifespan=500)
 
     def bezier(self, t, points):
         return (1-t)**2 * points[0] + 2*(1-t)*t * points[1] + t**2 * points[2]
@@ -1046,6 +807,6 @@ class WindBladeEffect(NinjutsuEffect):
         super().update(dt)
         self.pos += self.direction * self.speed * dt
         self.rect.center = self.pos
-        Particle(self.rect.center, self.groups, color=(200, 200, 200), initial_size=2, lifespan=100)
+        emit_particle(self.rect.center, color=(200, 200, 200), initial_size=2, lifespan=100)
 
 # Add more effect classes for other ninjutsu as needed
\ No newline at end of file
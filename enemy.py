@@ -6,72 +6,40 @@ from tile import Tile
 from effects import *
 from ItemDrop import ItemDrop
 import random
-from text_display import FloatingText
-
-def load_spritesheet(image_path, sprite_width, sprite_height, rows, columns):
-    sheet = pygame.image.load(image_path).convert_alpha()
-    sheet_width, sheet_height = sheet.get_size()
-    sprites = []
-
-    for row in range(rows):
-        row_sprites = []
-        for col in range(columns):
-            rect = pygame.Rect(col * sprite_width, row * sprite_height, sprite_width, sprite_height)
-            if rect.right <= sheet_width and rect.bottom <= sheet_height:
-                sprite = sheet.subsurface(rect).copy()
-                if not is_sprite_empty(sprite):
-                    row_sprites.append(sprite)
-        if row_sprites:
-            sprites.append(row_sprites)
-
-    return sprites
-
-def is_sprite_empty(sprite):
-    """Verifica se o sprite é vazio (transparente)"""
-    for x in range(sprite.get_width()):
-        for y in range(sprite.get_height()):
-            if sprite.get_at((x, y)).a != 0:
-                return False
-    return True
+from text_display import FloatingText, render_text
+from lighting import add_light
+from archetypes import get_archetype, RANK_MULTIPLIERS, ACTION_MAP
 
 class Enemy(pygame.sprite.Sprite):
-    RANK_MULTIPLIERS = {
-        'D': 1.0,
-        'C': 1.2,
-        'B': 1.5,
-        'A': 2.0,
-        'S': 3.5
-    }
+    RANK_MULTIPLIERS = RANK_MULTIPLIERS
 
     def __init__(self, name, rank, pos, groups, projectile_group, level):
         super().__init__(groups)
+        add_light(self, 45, (255, 180, 80))
         self.level = level
         self.groups_list = groups
         
-        # Pega os dados do monstro a partir do nome
-        data = monster_data.get(name)
-        if not data:
-            raise ValueError(f"Monster data for '{name}' not found.")
-        
-        multiplier = self.RANK_MULTIPLIERS.get(rank, 1.0)
-        self.multiplier = multiplier
-        self.hp = int(data['hp'] * multiplier)
+        # Quadros, máscaras e atributos do (nome, rank) são compartilhados; aqui só o estado próprio
+        archetype = self.archetype = get_archetype('enemy', name, rank)
+        self.multiplier = archetype.multiplier
+        self.hp = archetype.hp
         self.max_hp = self.hp
-        self.speed = int(data['speed'] * multiplier)
-        self.behavior = data['behavior']
-        self.vision_radius = int(data['vision_radius'] * multiplier)
-        self.melee_skill = int(data['melee_skill'] * multiplier)
-        self.defense_skill = int(data['defense_skill'] * multiplier)
+        self.speed = archetype.speed
+        self.behavior = archetype.behavior
+        self.vision_radius = archetype.vision_radius
+        self.melee_skill = archetype.melee_skill
+        self.defense_skill = archetype.defense_skill
         self.rank = rank
         self.name = name
-        self.throw_speed = 0.8*multiplier
+        self.throw_speed = archetype.throw_speed
         self.last_kawarimi_time = 0
-        
-        self.sprites = load_spritesheet(data['graphic'], 64, 64, 4, 4)
+
+        self.sprites = archetype.sprites
         self.current_sprite = 0
         self.image = self.sprites[0][self.current_sprite]
         self.rect = self.image.get_rect(center=pos)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.masks = archetype.masks
+        self.mask = self.masks[0][self.current_sprite]
 
         self.target = None
         self.last_attack_time = 0
@@ -88,16 +56,7 @@ class Enemy(pygame.sprite.Sprite):
         self.knockback_duration = 30
         self.knockback_velocity = 40
         
-        self.action_map = {
-            'down_walk': 0,
-            'up_walk': 1,
-            'walk_right': 2,
-            'walk_left': 3,
-            'idle_down': 4,
-            'idle_up': 5,
-            'idle_right': 6,
-            'idle_left': 7,
-        }
+        self.action_map = ACTION_MAP
         self.special_attack_active = False
         self.special_attack_timer = 0
         self.special_attack_stage = 0
@@ -112,9 +71,9 @@ class Enemy(pygame.sprite.Sprite):
         
         self.death_start_time = 0
         self.current_death_frame = 0
-        self.death_sprites = load_spritesheet('images/effects/blood_splash.png', 64, 64, 1, 16)
+        self.death_sprites = archetype.death_sprites
+        self.death_masks = archetype.death_masks
         self.floating_texts = pygame.sprite.Group()
-        self.font = pygame.font.Font(None, 20)
          # Cooldown para habilidades especiais
         self.special_attack_cooldown = 10
         self.last_special_attack_time = 0
@@ -162,15 +121,8 @@ class Enemy(pygame.sprite.Sprite):
                 self.is_knockedback = False
   
     def get_rank_color(self):
-        rank_colors = {
-            'S': (255, 0, 0),    # Red
-            'A': (255, 165, 150),  # Orange
-            'B': (255, 255, 0),  # Yellow
-            'C': (0, 255, 0),    # Green
-            'D': (0, 0, 255)     # Blue
-        }
-        return rank_colors.get(self.rank, (255, 255, 255))  # White as default
-            
+        return self.archetype.rank_color
+
     def draw_health_bar(self, screen):
         # Desenhar barra de HP
         hp_ratio = self.hp / self.max_hp
@@ -187,7 +139,7 @@ class Enemy(pygame.sprite.Sprite):
 
         # Desenhar nome e rank
         rank_color = self.get_rank_color()
-        text_surface = self.font.render(f'Rank {self.rank}  {self.name}', True, rank_color)
+        text_surface = render_text(self.archetype.label, 20, rank_color)  # mesmo texto todo quadro: vem do cache
         text_rect = text_surface.get_rect(midbottom=self.rect.midtop)
         text_rect = self.level.camera.apply_rect(text_rect)
         screen.blit(text_surface, text_rect)
@@ -206,7 +158,7 @@ class Enemy(pygame.sprite.Sprite):
             Kawarimi(self.rect.center, [self.level.all_sprites], self.level.all_sprites, self.level.top_sprites)
             self.rect.x += direction[0] * 4 * 32  # 4 tiles de distância
             self.rect.y += direction[1] * 4 * 32
-            Puff(self.rect.center, [self.level.all_sprites])
+            Puff.spawn(self.rect.center, [self.level.all_sprites])
             self.hp += amount  # Recupera o dano sofrido
             
             # Atualize o tempo da última ativação
@@ -229,7 +181,8 @@ class Enemy(pygame.sprite.Sprite):
             else:
                 self.random_move(dt)
                 self.animate(dt)
-        self.draw_health_bar(screen)
+        if screen is not None:
+            self.draw_health_bar(screen)
 
 
     def animate_death_step(self, dt, all_sprites, tiles):
@@ -242,6 +195,7 @@ class Enemy(pygame.sprite.Sprite):
             self.death_start_time = now
             if self.current_death_frame < len(self.death_sprites[0]):
                 self.image = self.death_sprites[0][self.current_death_frame]
+                self.mask = self.death_masks[0][self.current_death_frame]
                 self.current_death_frame += 1
 
     def random_move(self, dt):
@@ -323,24 +277,8 @@ class Enemy(pygame.sprite.Sprite):
         return distance <= self.vision_radius
 
     def find_closest_enemy(self):
-        closest_enemy = None
-        closest_distance = self.vision_radius
-        
-        # Iterar sobre todos os inimigos
-        enemy = self.level.player
-        distance = pygame.math.Vector2(enemy.rect.center).distance_to(pygame.math.Vector2(self.rect.center))
-        if distance < closest_distance:
-            closest_distance = distance
-            closest_enemy = enemy
-
-        # Iterar sobre todos os aliados
-        for ally in self.level.ally:
-            if ally != self:
-                distance = pygame.math.Vector2(ally.rect.center).distance_to(pygame.math.Vector2(self.rect.center))
-                if distance < closest_distance:
-                    closest_distance = distance
-                    closest_enemy = ally
-
+        # Jogador ou aliado mais próximo dentro do raio de visão
+        closest_enemy = self.level.proximity.nearest(self.rect.center, 'friends', self.vision_radius, exclude=self)
         self.target = closest_enemy
         return closest_enemy
 
@@ -352,6 +290,7 @@ class Enemy(pygame.sprite.Sprite):
                 self.current_time = 0
                 self.current_sprite = (self.current_sprite + 1) % len(self.sprites[action_index])
                 self.image = self.sprites[action_index][self.current_sprite]
+                self.mask = self.masks[action_index][self.current_sprite]
 
     def get_action_index(self, action):
         return self.action_map.get(action, 0)
@@ -402,7 +341,7 @@ class Enemy(pygame.sprite.Sprite):
 
     def perform_normal_attack(self, direction):
         projectile_type = random.choice(['kunai', 'shuriken', 'fuuma'] if self.rank in ['S', 'A', 'B'] else ['kunai', 'shuriken'])
-        Projectile(self.rect.center, direction, [self.groups_list[0], self.projectile_group], 
+        Projectile.spawn(self.rect.center, direction, [self.groups_list[0], self.projectile_group], 
                projectile_type, self.level, self.throw_speed, side='enemy_projectile')
 
     def borderless(self, tile_size, map_width, map_height):
@@ -424,7 +363,7 @@ class Enemy(pygame.sprite.Sprite):
         self.kawarimi(amount)  # Tenta ativar a habilidade Kawarimi
         self.hp -= amount        
         self.vision_radius += 300
-        FloatingText(str(amount), self.rect, color, self.level.camera, all_sprites)
+        FloatingText.spawn(str(amount), self.rect, color, self.level.camera, all_sprites)
         self.knockback_velocity = knockback_direction * 200
         self.is_knockedback = True
         self.knockback_start_time = pygame.time.get_ticks()
@@ -450,11 +389,11 @@ class Enemy(pygame.sprite.Sprite):
             # Etapa 1: Teletransportar
             directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
             direction = random.choice(directions)
-            Puff(self.rect.center,[self.level.all_sprites,self.level.overlay_sprites])
+            Puff.spawn(self.rect.center,[self.level.all_sprites,self.level.overlay_sprites])
             self.rect.x += direction[0] * 3 * 32  # 3 tiles de distância
             self.rect.y += direction[1] * 3 * 32
             self.special_attack_stage = 1
-            Puff(self.rect.center,[self.level.all_sprites,self.level.overlay_sprites])
+            Puff.spawn(self.rect.center,[self.level.all_sprites,self.level.overlay_sprites])
             self.special_attack_timer = pygame.time.get_ticks()
         elif self.special_attack_stage == 1:
             # Etapa 2: Pausar
@@ -466,7 +405,7 @@ class Enemy(pygame.sprite.Sprite):
             if self.target:
                 fireball_direction = pygame.math.Vector2(self.target.rect.center) - pygame.math.Vector2(self.rect.center)
                 fireball_direction.normalize_ip()
-                Projectile(self.rect.center, fireball_direction, [self.groups_list[0], self.projectile_group], 'fireball', self.level, self.throw_speed, side='enemy_projectile')
+                Projectile.spawn(self.rect.center, fireball_direction, [self.groups_list[0], self.projectile_group], 'fireball', self.level, self.throw_speed, side='enemy_projectile')
                 self.special_attack_active = False  # Finaliza o ataque especial
                 self.special_attack_stage = 0
                 if self.rank in ['S', 'A', 'B','C','D']:
@@ -477,6 +416,6 @@ class Enemy(pygame.sprite.Sprite):
     def area_attack(self):
         for angle in range(0, 360, int(90 // self.multiplier)):
             direction = pygame.math.Vector2(1, 0).rotate(angle)
-            Projectile(self.rect.center, direction, [self.groups_list[0], self.projectile_group], 'fuuma', self.level, self.throw_speed, side='enemy_projectile')
+            Projectile.spawn(self.rect.center, direction, [self.groups_list[0], self.projectile_group], 'fuuma', self.level, self.throw_speed, side='enemy_projectile')
     
     
\ No newline at end of file
@@ -0,0 +1,90 @@
+import weakref
+
+KEYDOWN = 'keydown'
+KEYUP = 'keyup'
+
+
+class Subscription:
+    """One handler on one (event type, key), held by a weak reference.
+
+    Bound methods are kept with WeakMethod, so subscribing does not keep the object
+    (a Player, and through it its Level) alive; when the object goes away the
+    subscription removes itself.
+    """
+
+    def __init__(self, bus, event_type, key, handler, scope):
+        self.bus = bus
+        self.slot = (event_type, key)
+        self.scope = id(scope) if scope is not None else None  # só o id: o escopo não fica vivo por causa do bus
+        if hasattr(handler, '__self__'):
+            self.ref = weakref.WeakMethod(handler, self.expired)
+        else:
+            self.ref = weakref.ref(handler, self.expired)
+
+    def expired(self, ref):
+        self.bus.unsubscribe(self)
+
+    def __call__(self, *args):
+        handler = self.ref()
+        if handler is not None:
+            handler(*args)
+
+
+class EventBus:
+    """Publish/subscribe keyed by (event type, key), e.g. (KEYDOWN, pygame.K_j).
+
+    A handler subscribed with key=None hears every key of its type. publish() only
+    walks the subscriptions of its own key plus the catch-all ones. A subscription
+    may name a scope (the Level that owns the subscriber): close_scope(level) drops
+    every subscription of that Level at once, without waiting for the garbage
+    collector. live() counts the subscriptions still registered, to spot leaks.
+    """
+
+    def __init__(self):
+        self.slots = {}   # (tipo, tecla) -> {Subscription: None}, na ordem de inscrição
+        self.scopes = {}  # id(escopo) -> {Subscription: None}
+
+    def subscribe(self, event_type, handler, key=None, scope=None):
+        subscription = Subscription(self, event_type, key, handler, scope)
+        self.slots.setdefault(subscription.slot, {})[subscription] = None
+        if scope is not None:
+            self.scopes.setdefault(subscription.scope, {})[subscription] = None
+        return subscription
+
+    def unsubscribe(self, subscription):
+        slot = self.slots.get(subscription.slot)
+        if slot is not None:
+            slot.pop(subscription, None)
+            if not slot:
+                del self.slots[subscription.slot]
+        if subscription.scope is not None:
+            scope = self.scopes.get(subscription.scope)
+            if scope is not None:
+                scope.pop(subscription, None)
+                if not scope:
+                    del self.scopes[subscription.scope]
+            subscription.scope = None
+
+    def close_scope(self, scope):
+        for subscription in list(self.scopes.get(id(scope), ())):
+            self.unsubscribe(subscription)
+
+    def publish(self, event_type, key=None, *args):
+        # Cópia das listas: um handler pode se inscrever ou sair durante o envio
+        handlers = list(self.slots.get((event_type, key), ()))
+        if key is not None:
+            handlers += self.slots.get((event_type, None), ())
+        for subscription in handlers:
+            try:
+                subscription(key, *args)
+            except Exception as e:
+                print("Error during event notification: " + str(e))
+
+    def live(self):
+        return sum(len(slot) for slot in self.slots.values())
+
+    def stats(self):
+        return {'live': self.live(), 'slots': len(self.slots), 'scopes': len(self.scopes)}
+
+
+events = EventBus()
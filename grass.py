@@ -1,8 +1,21 @@
 import pygame
 import random
 import math
+import numpy as np
+
+ROTATION_STEP = 3  # Graus entre as imagens pré-rotacionadas das lâminas
+GRASS_TINT = (200, 200, 200, 180)
+
 
 class GrassManager:
+    """Grass blades of the level, stored as NumPy arrays (one row per blade).
+
+    apply_force() updates the target rotation of every blade, from the player's push
+    and from the wind, in one vectorised pass; update() eases the rotations towards
+    their targets. render() only looks at blades on tiles inside the camera view and
+    blits them from a table of tinted images pre-rotated every ROTATION_STEP degrees.
+    """
+
     def __init__(self, grass_path='images/map', tile_size=32, max_unique=10):
         self.grass_images = self.load_grass_images(grass_path)
         if not self.grass_images:
@@ -11,6 +24,18 @@ class GrassManager:
         self.grass_tiles = {}
         self.wind_force = pygame.math.Vector2(0, 0)
         self.player_pos = pygame.math.Vector2(0, 0)
+        self.max_rotation = 25
+        self.max_wind_rotation = 11
+        self.steps = math.ceil(self.max_rotation / ROTATION_STEP)
+        self.rotations, self.offsets = self.build_rotation_table()
+
+        self.placed = []  # lâminas novas, juntadas aos arrays no próximo uso
+        self.tile = np.zeros((0, 2), np.int32)
+        self.pos = np.zeros((0, 2), np.float32)
+        self.rotation = np.zeros(0, np.float32)
+        self.target = np.zeros(0, np.float32)
+        self.wind_factor = np.zeros(0, np.float32)
+        self.image = np.zeros(0, np.int32)
 
     def load_grass_images(self, path):
         images = []
@@ -22,10 +47,46 @@ class GrassManager:
             print(f"Error loading image {img_path}: {e}")
         return images
 
-    def place_tile(self, location, density):
-        if tuple(location) not in self.grass_tiles:
-            self.grass_tiles[tuple(location)] = GrassTile(self.tile_size, location, density, self.grass_images, self)
-        print(f"Placed grass at {location} with density {density}")  # Debug print
+    def build_rotation_table(self):
+        # Para cada imagem: uma cópia tingida por ângulo quantizado, e o deslocamento até a base da lâmina
+        rotations = []
+        offsets = []
+        for image in self.grass_images:
+            for step in range(-self.steps, self.steps + 1):
+                rotated = pygame.transform.rotate(image, step * ROTATION_STEP)
+                rotated.fill(GRASS_TINT, special_flags=pygame.BLEND_RGBA_MULT)
+                rotations.append(rotated)
+                offsets.append((-(rotated.get_width() // 2), -rotated.get_height()))
+        return rotations, np.array(offsets, np.int32).reshape(-1, 2)
+
+    def place_tile(self, location, density, rng=random):
+        location = tuple(location)
+        if location in self.grass_tiles:
+            return
+        self.grass_tiles[location] = density
+        tile_size = self.tile_size
+        for _ in range(density):
+            x = rng.random() * tile_size
+            y = rng.random() * tile_size / 2 + tile_size / 2
+            image = rng.randrange(len(self.grass_images))
+            self.placed.append((location[0], location[1], location[0] * tile_size + x, location[1] * tile_size + y,
+                                rng.uniform(0.5, 1.5), image))
+
+    def commit(self):
+        if not self.placed:
+            return
+        placed = np.array(self.placed, np.float64)
+        count = len(placed)
+        self.tile = np.concatenate([self.tile, placed[:, 0:2].astype(np.int32)])
+        self.pos = np.concatenate([self.pos, placed[:, 2:4].astype(np.float32)])
+        self.wind_factor = np.concatenate([self.wind_factor, placed[:, 4].astype(np.float32)])
+        self.image = np.concatenate([self.image, placed[:, 5].astype(np.int32)])
+        self.rotation = np.concatenate([self.rotation, np.zeros(count, np.float32)])
+        self.target = np.concatenate([self.target, np.zeros(count, np.float32)])
+        self.placed.clear()
+
+    def __len__(self):
+        return len(self.pos) + len(self.placed)
 
     def update_wind(self, wind_vector):
         self.wind_force = wind_vector * 0.2
@@ -34,82 +95,60 @@ class GrassManager:
         self.player_pos = pygame.math.Vector2(player_pos)
 
     def apply_force(self, location, radius, dropoff):
-        for tile_location, tile in self.grass_tiles.items():
-            tile_center = pygame.math.Vector2(tile_location) * self.tile_size + pygame.math.Vector2(self.tile_size // 2, self.tile_size // 2)
-            distance_to_player = (tile_center - self.player_pos).length()
-            wind_factor = min(1.0, distance_to_player / 500)
-
-            if (tile_center - pygame.math.Vector2(location)).length_squared() < (radius + dropoff) ** 2:
-                tile.apply_force(location, radius, dropoff)
-
-            tile.apply_wind(self.wind_force * wind_factor)
-
-    def update_render(self, screen, dt, camera):
-        for tile in self.grass_tiles.values():
-            tile.render(screen, dt, camera)
-        print(f"Rendering {len(self.grass_tiles)} grass tiles")  # Debug print
-
-class GrassTile:
-    def __init__(self, tile_size, location, density, grass_images, manager):
-        self.manager = manager
-        self.location = location
-        self.blades = [GrassBlade(random.random() * tile_size, random.random() * tile_size / 2 + tile_size / 2, 
-                                  random.choice(grass_images)) for _ in range(density)]
-
-    def apply_force(self, force_point, force_radius, force_dropoff):
-        for blade in self.blades:
-            blade.apply_force(force_point, force_radius, force_dropoff, self.location)
-
-    def apply_wind(self, wind_force):
-        for blade in self.blades:
-            blade.apply_wind(wind_force)
-
-    def render(self, screen, dt, camera):
-        for blade in self.blades:
-            blade.render(screen, dt, camera, self.location, self.manager.tile_size)
-
-class GrassBlade:
-    def __init__(self, x, y, image):
-        self.pos = pygame.math.Vector2(x, y)
-        self.original_image = image
-        self.image = image.copy()
-        self.rotation = 0
-        self.target_rotation = 0
-        self.max_rotation = 25
-        self.wind_factor = random.uniform(0.5, 1.5)
-        self.max_wind_rotation = 11
-
-    def apply_force(self, force_point, force_radius, force_dropoff, tile_location):
-        blade_pos = self.pos + pygame.math.Vector2(tile_location) * 32
-        force_vector = blade_pos - pygame.math.Vector2(force_point)
-        distance = force_vector.length()
-        if distance < force_radius + force_dropoff:
-            force = max(0, 1 - (distance - force_radius) / force_dropoff)
-            angle = math.degrees(math.atan2(force_vector.y, force_vector.x))
-            target_angle = angle + 180
-            self.target_rotation = max(-self.max_rotation, min(self.max_rotation, target_angle * force * 0.8))
-
-    def apply_wind(self, wind_force):
-        wind_angle = math.degrees(math.atan2(wind_force.y, wind_force.x))
-        wind_strength = wind_force.length() * self.wind_factor
-        wind_rotation = wind_angle * wind_strength
-        wind_rotation = max(-self.max_wind_rotation, min(self.max_wind_rotation, wind_rotation))
-        self.target_rotation += wind_rotation
-
-    def render(self, screen, dt, camera, tile_location, tile_size):
-        if abs(self.target_rotation) < 0.1:
-            self.target_rotation = 0
-        else:
-            self.target_rotation *= 0.95
-
-        self.rotation = self.rotation * 0.9 + self.target_rotation * 0.1
-
-        rotated_image = pygame.transform.rotate(self.original_image, self.rotation)
-        
-        toned_down_image = rotated_image.copy()
-        toned_down_image.fill((200, 200, 200, 180), special_flags=pygame.BLEND_RGBA_MULT)
-        
-        pos = self.pos + pygame.math.Vector2(tile_location) * tile_size
-        grass_rect = pygame.Rect(pos.x, pos.y, toned_down_image.get_width(), toned_down_image.get_height())
-        screen_pos = camera.apply_rect(grass_rect)
-        screen.blit(toned_down_image, (screen_pos.x - toned_down_image.get_width() // 2, screen_pos.y - toned_down_image.get_height()))
+        self.commit()
+        if not len(self.pos):
+            return
+        half = self.tile_size // 2
+        tile_center = self.tile * self.tile_size + half
+        reach = radius + dropoff
+
+        # Empurrão: só lâminas de tiles ao alcance e elas mesmas ao alcance
+        offset = self.pos - np.array(location, np.float32)
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        near_tile = ((tile_center - np.array(location)) ** 2).sum(axis=1) < reach ** 2
+        pushed = near_tile & (distance < reach)
+        if pushed.any():
+            force = np.maximum(0, 1 - (distance[pushed] - radius) / dropoff)
+            angle = np.degrees(np.arctan2(offset[pushed, 1], offset[pushed, 0])) + 180
+            self.target[pushed] = np.clip(angle * force * 0.8, -self.max_rotation, self.max_rotation)
+
+        # Vento: mais fraco perto do jogador
+        wind = self.wind_force
+        if wind.x or wind.y:
+            to_player = tile_center - np.array((self.player_pos.x, self.player_pos.y))
+            factor = np.minimum(1.0, np.hypot(to_player[:, 0], to_player[:, 1]) / 500)
+            wind_angle = math.degrees(math.atan2(wind.y, wind.x))
+            strength = wind.length() * factor * self.wind_factor
+            self.target += np.clip(wind_angle * strength, -self.max_wind_rotation, self.max_wind_rotation)
+
+    def update(self, dt):
+        self.commit()
+        target = self.target
+        settled = np.abs(target) < 0.1
+        target *= 0.95
+        target[settled] = 0
+        # O vento soma a cada tick: sem o limite a lâmina giraria além da tabela de rotações
+        np.clip(target, -self.max_rotation, self.max_rotation, out=target)
+        self.rotation *= 0.9
+        self.rotation += target * 0.1
+
+    def render(self, screen, camera):
+        self.commit()
+        if not len(self.pos):
+            return
+        # Só tiles dentro da visão (com um tile de folga para lâminas inclinadas)
+        view = camera.get_visible_rect()
+        size = self.tile_size
+        tile_x, tile_y = self.tile[:, 0], self.tile[:, 1]
+        visible = np.flatnonzero((tile_x >= view.left // size - 1) & (tile_x <= view.right // size + 1)
+                                 & (tile_y >= view.top // size) & (tile_y <= view.bottom // size + 2))
+        if not len(visible):
+            return
+        steps = self.steps
+        index = np.clip(np.rint(self.rotation[visible] / ROTATION_STEP).astype(np.int32), -steps, steps) + steps
+        index += self.image[visible] * (2 * steps + 1)
+        offset_x, offset_y = camera.camera.topleft
+        left = (self.pos[visible, 0].astype(np.int32) + offset_x + self.offsets[index, 0]).tolist()
+        top = (self.pos[visible, 1].astype(np.int32) + offset_y + self.offsets[index, 1]).tolist()
+        surfaces = map(self.rotations.__getitem__, index.tolist())
+        screen.blits(list(zip(surfaces, zip(left, top))), doreturn=False)
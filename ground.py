@@ -0,0 +1,99 @@
+import numpy as np
+import pygame
+from settings import GROUND_CHUNK_TILES
+from tile import Tile
+
+
+class GroundLayer(pygame.sprite.Group):
+    """Group for the static ground tiles, drawn from pre-composited chunk surfaces.
+
+    Tiles added to the group are bucketed by chunk. A chunk is baked into a single
+    Surface the first time it becomes visible, so drawing the ground costs one blit
+    per visible chunk instead of one blit per tile. Non-Tile sprites (animated
+    bonfires, water emitters) can still live in the group; they are not baked.
+    add_backdrop() takes plain images that never change (an image and an array of
+    positions): they are painted under the tiles when a chunk is baked, without
+    making a sprite for each copy.
+    """
+
+    def __init__(self, tile_size=32, chunk_tiles=GROUND_CHUNK_TILES):
+        super().__init__()
+        self.chunk_size = tile_size * chunk_tiles
+        self.buckets = {}  # (cx, cy) -> tiles touching the chunk, in insertion order
+        self.chunks = {}   # (cx, cy) -> baked Surface
+        self.baked = set()
+        self.backdrops = []  # (image, array N x 2 com os cantos superiores esquerdos)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if not isinstance(sprite, Tile):
+            return
+        self.baked.add(sprite)
+        for key in self.chunk_keys(sprite.rect):
+            self.buckets.setdefault(key, []).append(sprite)
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                # Chunk already baked (e.g. a corpse dropped mid-fight): paint the tile on top
+                chunk.blit(sprite.image, sprite.rect.move(-key[0] * self.chunk_size, -key[1] * self.chunk_size))
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if sprite not in self.baked:
+            return
+        self.baked.discard(sprite)
+        for key in self.chunk_keys(sprite.rect):
+            bucket = self.buckets.get(key)
+            if bucket and sprite in bucket:
+                bucket.remove(sprite)
+            # Re-bake lazily the next time the chunk is visible
+            self.chunks.pop(key, None)
+
+    def add_backdrop(self, image, positions):
+        # positions: cantos inferiores direitos, como o pos de Tile
+        width, height = image.get_size()
+        topleft = np.asarray(positions, np.int32).reshape(-1, 2) - (width, height)
+        self.backdrops.append((image, topleft))
+        size = self.chunk_size
+        first = topleft // size
+        last = (topleft + (width - 1, height - 1)) // size
+        # A imagem é menor que um chunk: os chunks dos quatro cantos cobrem todos
+        corners = np.concatenate([first, last, np.stack([first[:, 0], last[:, 1]], axis=1),
+                                  np.stack([last[:, 0], first[:, 1]], axis=1)])
+        for key in set(zip(corners[:, 0].tolist(), corners[:, 1].tolist())):
+            self.buckets.setdefault(key, [])
+            self.chunks.pop(key, None)
+
+    def is_baked(self, sprite):
+        return sprite in self.baked
+
+    def chunk_keys(self, rect):
+        size = self.chunk_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cx, cy
+
+    def bake_chunk(self, key):
+        size = self.chunk_size
+        chunk = pygame.Surface((size, size))
+        chunk.fill((0, 0, 0))
+        offset_x, offset_y = key[0] * size, key[1] * size
+        for image, topleft in self.backdrops:
+            width, height = image.get_size()
+            x, y = topleft[:, 0], topleft[:, 1]
+            inside = (x < offset_x + size) & (x + width > offset_x) & (y < offset_y + size) & (y + height > offset_y)
+            chunk.blits([(image, (left - offset_x, top - offset_y)) for left, top in topleft[inside].tolist()], doreturn=False)
+        for tile in self.buckets.get(key, ()):
+            chunk.blit(tile.image, tile.rect.move(-offset_x, -offset_y))
+        self.chunks[key] = chunk
+        return chunk
+
+    def draw_visible(self, screen, camera):
+        size = self.chunk_size
+        visible = camera.get_visible_rect()
+        for key in self.chunk_keys(visible):
+            if key not in self.buckets:
+                continue
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                chunk = self.bake_chunk(key)
+            screen.blit(chunk, camera.apply_rect(pygame.Rect(key[0] * size, key[1] * size, size, size)))
@@ -0,0 +1,155 @@
+"""Roda a simulação do Level sem janela, para benchmark e testes de longa duração (soak).
+
+    python headless.py --level 30 --seconds 60
+    python headless.py --level 30 --input random --render --report 30   # soak
+    python headless.py --level 30 --level-seed 7     # sempre o mesmo mapa (do cache de descritores)
+    SHINOBI_LEVEL_CACHE=/tmp/levels python headless.py --level-seed 7   # cache em outra pasta ('off' desliga)
+
+Uses the SDL dummy video/audio drivers, a virtual clock (fixed dt per tick, and
+pygame.time.get_ticks() follows it unless --real-time is given, so cooldowns and
+lifespans advance with the simulation instead of the wall clock) and scripted or
+no input. Prints ticks per second every --report seconds. When the player dies or
+the level is cleared the level is rebuilt, so the run can go on for hours. Levels
+without --level-seed get a fresh random seed and are never written to the cache.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from settings import *
+from event_bus import events
+
+
+class VirtualClock:
+    """Drop-in for pygame.time.Clock that advances a fixed step per tick."""
+
+    def __init__(self, dt=FIXED_DT):
+        self.dt = dt
+        self.ticks = 0
+        self.now = 0.0
+
+    def tick(self, framerate=0):
+        self.ticks += 1
+        self.now += self.dt
+        return self.dt * 1000
+
+    def get_ticks(self):
+        return int(self.now * 1000)
+
+    def install(self):
+        # Todos os módulos chamam pygame.time.get_ticks() na hora, então basta trocar a função
+        pygame.time.get_ticks = self.get_ticks
+
+
+def build_level(level_number, surface, controls, level_seed=None, build_times=None):
+    from level import Level
+    from level_gen import load_descriptor
+    build_start = time.perf_counter()
+    descriptor = load_descriptor(level_number, level_seed) if level_seed is not None else None
+    level = Level(surface, level_number, controls=controls, descriptor=descriptor)
+    if build_times is not None:
+        build_times.append((time.perf_counter() - build_start) * 1000)
+    return level
+
+
+def make_controls(kind, seed):
+    from controls import RandomControls, ScriptedControls
+    if kind == 'random':
+        return RandomControls(seed)
+    return ScriptedControls()
+
+
+def report(out, label, ticks, elapsed, level, restarts, build_times=()):
+    rate = ticks / elapsed if elapsed > 0 else 0.0
+    out.write(f"[{label}] ticks={ticks} ticks/s={rate:.1f} ms/tick={1000 / rate if rate else 0:.2f} "
+              f"sprites={len(level.all_sprites)} particles={len(level.particles)}/{int(level.particles.budget.cap)} projectiles={len(level.projectiles)} "
+              f"enemies={len(level.enemies)} restarts={restarts}\n")
+    if label == 'total':
+        from pooling import pool_stats
+        from audio import load_sounds
+        for name, stats in pool_stats().items():
+            out.write(f"  pool {name}: " + ' '.join(f"{key}={value}" for key, value in stats.items()) + "\n")
+        out.write("  sounds: " + ' '.join(f"{key}={value}" for key, value in load_sounds().stats().items()) + "\n")
+        out.write("  events: " + ' '.join(f"{key}={value}" for key, value in events.stats().items()) + "\n")
+        if build_times:
+            # Construção do Level (descritor + sprites), em ms: a primeira inclui o carregamento das imagens
+            out.write(f"  level builds: count={len(build_times)} first={build_times[0]:.0f} "
+                      f"mean={sum(build_times) / len(build_times):.0f} max={max(build_times):.0f}\n")
+    out.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--level', type=int, default=30)
+    parser.add_argument('--ticks', type=int, default=0, help='stop after N ticks (0 = no limit)')
+    parser.add_argument('--seconds', type=float, default=0, help='stop after N wall-clock seconds (0 = no limit)')
+    parser.add_argument('--dt', type=float, default=FIXED_DT, help='simulated seconds per tick')
+    parser.add_argument('--input', choices=('none', 'random'), default='none')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--level-seed', type=int, default=None, help='fixed map seed (descriptor loaded from the level cache)')
+    parser.add_argument('--render', action='store_true', help='also draw every tick to an offscreen surface')
+    parser.add_argument('--real-time', action='store_true', help='keep pygame.time.get_ticks() on the wall clock')
+    parser.add_argument('--report', type=float, default=5.0, help='seconds between reports')
+    parser.add_argument('--verbose', action='store_true', help="keep the game's own prints")
+    args = parser.parse_args(argv)
+
+    if not args.ticks and not args.seconds:
+        args.seconds = 10  # sem limite nenhum só termina com Ctrl+C: exige um explicitamente
+
+    out = sys.stdout
+    if not args.verbose:
+        # O jogo imprime a cada colisão; num soak de horas isso domina o tempo
+        sys.stdout = open(os.devnull, 'w')
+
+    random.seed(args.seed)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    surface = pygame.Surface((WIDTH // 2, HEIGHT // 2))  # mesma resolução interna do Game
+
+    clock = VirtualClock(args.dt)
+    if not args.real_time:
+        clock.install()
+    controls = make_controls(args.input, args.seed)
+    build_times = []
+    level = build_level(args.level, surface, controls, args.level_seed, build_times)
+
+    restarts = 0
+    ticks = 0
+    start = last_report = time.perf_counter()
+    last_ticks = 0
+    try:
+        while True:
+            dt = clock.tick() / 1000
+            pygame.event.pump()
+            controls.step(ticks)
+            level.update(dt)
+            if args.render:
+                level.draw(surface)
+            ticks += 1
+
+            if level.player.hp <= 0 or level.enemy_count == 0:
+                restarts += 1
+                events.close_scope(level)
+                level = build_level(args.level, surface, controls, args.level_seed, build_times)
+
+            now = time.perf_counter()
+            if now - last_report >= args.report:
+                report(out, 'interval', ticks - last_ticks, now - last_report, level, restarts)
+                last_report, last_ticks = now, ticks
+            if (args.ticks and ticks >= args.ticks) or (args.seconds and now - start >= args.seconds):
+                break
+    except KeyboardInterrupt:
+        pass
+
+    report(out, 'total', ticks, time.perf_counter() - start, level, restarts, build_times)
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
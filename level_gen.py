@@ -0,0 +1,542 @@
+import os
+import random
+import sys
+import threading
+import zipfile
+import zlib
+import numpy as np
+import pygame
+from settings import *
+
+GREEN = (0, 255, 0)
+BROWN = (139, 69, 19)
+GRAY = (130, 130, 130)
+BLUE = (0, 50, 255)
+ORANGE = (220, 165, 0)
+
+TILE_SIZE = 32
+ENEMY_FRAME = 64  # quadro da spritesheet dos inimigos: Enemy centra o quadro na posição e corta o rect pela metade
+
+# Códigos das tabelas compactas do descritor
+ENTRY_KINDS = ('bonfire', 'river', 'water', 'bridge', 'trunk', 'overlay', 'rock')
+BONFIRE, RIVER, WATER, BRIDGE, TRUNK, OVERLAY, ROCK = range(len(ENTRY_KINDS))
+ELEMENTS = (None, 'empty', 'tree', 'rock', 'river', 'bridge', 'grass', 'bonfire')
+RANKS = ('S', 'A', 'B', 'C', 'D')
+
+DESCRIPTOR_VERSION = 1  # mude quando o gerador ou o formato mudarem: o cache antigo é ignorado
+LEVEL_CACHE_ENV = 'SHINOBI_LEVEL_CACHE'  # variável de ambiente: pasta do cache de níveis, ou 'off' para desligar
+
+
+class MapController:
+    """Grid of map elements ('empty', 'tree', 'river', ...) used to lay out the level.
+
+    The grid is plain data, so it can be filled on the worker thread; the minimap
+    surface is only built from it (on the main thread) when draw_map() needs it.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.map = None  # minimapa, refeito quando o grid muda
+        self.scaled_map = None
+        self.elements = {
+            'tree': BROWN,
+            'rock': GRAY,
+            'river': BLUE,
+            'bridge': ORANGE,
+            'grass': GREEN,
+            'empty': GREEN,
+            'bonfire': (255, 100, 0)  # Add this line with an appropriate color for bonfire
+        }
+        self.element_grid = [[None for _ in range(height)] for _ in range(width)]
+
+    def set_element(self, x, y, element_type):
+        self.element_grid[x][y] = element_type
+        self.map = None
+
+    def add_element(self, x, y, element_type):
+        if element_type in self.elements:
+            if 0 <= x < self.width and 0 <= y < self.height:
+                self.set_element(x, y, element_type)
+            else:
+                # If out of range, place a grass tile at the edge of the map
+                edge_x = max(0, min(x, self.width - 1))
+                edge_y = max(0, min(y, self.height - 1))
+                self.set_element(edge_x, edge_y, 'grass')
+        else:
+            raise ValueError(f"Unknown element: {element_type}")
+
+    def add_rect(self, x, y, width, height, element_type):
+        if element_type in self.elements:
+            for i in range(x, x + width):
+                for j in range(y, y + height):
+                    if 0 <= i < self.width and 0 <= j < self.height:
+                        self.set_element(i, j, element_type)
+                    else:
+                        # If out of range, place a grass tile at the edge of the map
+                        edge_i = max(0, min(i, self.width - 1))
+                        edge_j = max(0, min(j, self.height - 1))
+                        self.set_element(edge_i, edge_j, 'grass')
+        else:
+            raise ValueError(f"Unknown element: {element_type}")
+
+    def is_area_empty(self, x, y):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+
+        for dy in [-1, 0, 1]:
+            for dx in [-1, 0, 1]:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.width and 0 <= ny < self.height:
+                    if self.element_grid[nx][ny] != 'empty':
+                        return False
+        return True
+
+    def find_empty_areas(self):
+        empty_areas = []
+        for y in range(self.height):
+            for x in range(self.width):
+                if self.is_area_empty(x, y):
+                    empty_areas.append((x, y))
+        return empty_areas
+
+    def codes(self):
+        # Grid como array uint8 (índices de ELEMENTS), para o descritor
+        index = {element: code for code, element in enumerate(ELEMENTS)}
+        return np.array([[index[element] for element in column] for column in self.element_grid], np.uint8)
+
+    @classmethod
+    def from_codes(cls, codes):
+        map_controller = cls(*codes.shape)
+        map_controller.element_grid = [[ELEMENTS[code] for code in column] for column in codes.tolist()]
+        return map_controller
+
+    def get_element_at(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.element_grid[x][y]
+        return None
+
+    def find_elements_of_type(self, element_type):
+        positions = []
+        for y in range(self.height):
+            for x in range(self.width):
+                if self.element_grid[x][y] == element_type:
+                    positions.append((x, y))
+        return positions
+
+    def build_map(self, scale_factor):
+        self.map = pygame.Surface((self.width, self.height))
+        self.map.fill(GREEN)
+        for x, column in enumerate(self.element_grid):
+            for y, element_type in enumerate(column):
+                if element_type is not None:
+                    self.map.set_at((x, y), self.elements[element_type])
+        self.scaled_map = pygame.transform.scale(self.map, (self.width * scale_factor, self.height * scale_factor))
+
+    def draw_map(self, screen, scale_factor=2):
+        if self.map is None or self.scaled_map.get_width() != self.width * scale_factor:
+            self.build_map(scale_factor)
+        screen.blit(self.scaled_map, (600, 500))
+        border_color = (139, 69, 19)
+        border_width = 1
+        pygame.draw.rect(screen, border_color, (600, 500, self.width * scale_factor, self.height * scale_factor), border_width)
+
+
+class LevelDescriptor:
+    """Everything procedural about one level, as compact arrays, reproducible from its seed.
+
+    `entries` is an int32 array of rows (kind, image, x, y) in creation order, kind
+    indexing ENTRY_KINDS and image indexing `image_paths` (-1 for none); `grass` rows
+    are (tile x, tile y, density); `enemies` rows are (monster, rank, x, y), indexing
+    monster_data and RANKS; `ally` is (ally, rank); `elements` is the MapController
+    grid as ELEMENTS codes. The 3x3 grass backdrop follows from the dimensions.
+    save()/load() write and read it as a versioned .npz file.
+    """
+
+    ARRAYS = ('entries', 'grass', 'enemies', 'ally', 'elements')
+
+    def __init__(self, level_number, seed, grid_width, grid_height, image_paths, entries, grass, enemies, ally, elements):
+        self.level_number = level_number
+        self.seed = seed
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.image_paths = list(image_paths)
+        self.entries = entries
+        self.grass = grass
+        self.enemies = enemies
+        self.ally = ally
+        self.elements = elements
+
+    def ground(self):
+        # Cantos inferiores direitos da grama do mapa e das 8 cópias em volta (mundo sem bordas)
+        w, h = self.grid_width, self.grid_height
+        xs, ys = np.meshgrid(np.arange(-w, 2 * w), np.arange(-h, 2 * h))
+        return np.stack([xs.ravel(), ys.ravel()], axis=1).astype(np.int32) * TILE_SIZE
+
+    def map_controller(self):
+        return MapController.from_codes(self.elements)
+
+    def save(self, path):
+        header = np.array([DESCRIPTOR_VERSION, self.level_number, self.seed, self.grid_width, self.grid_height], np.int64)
+        arrays = {name: getattr(self, name) for name in self.ARRAYS}
+        # Escreve num temporário e troca: outra thread/processo nunca lê um arquivo pela metade
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as file:
+            np.savez(file, header=header, image_paths=np.array(self.image_paths, dtype=str), **arrays)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            version, level_number, seed, grid_width, grid_height = data['header'].tolist()
+            if version != DESCRIPTOR_VERSION:
+                raise ValueError(f"descriptor version {version}, expected {DESCRIPTOR_VERSION}")
+            arrays = [data[name] for name in cls.ARRAYS]
+            image_paths = data['image_paths'].tolist()
+        return cls(level_number, seed, grid_width, grid_height, image_paths, *arrays)
+
+
+class LevelGenerator:
+    """Builds the LevelDescriptor of (level_number, seed) from a private Random.
+
+    Runs on any thread: it only reads settings and image sizes, and the same seed
+    always gives the same descriptor.
+    """
+
+    def __init__(self, level_number, seed, report=None):
+        self.level_number = level_number
+        self.seed = seed
+        level_info = level_data.get(level_number, level_data[1])
+        self.grid_width, self.grid_height = level_info['dimensions']
+        self.num_enemies = level_info['num_enemies']
+        self.random = random.Random(seed)
+        self.report = report or (lambda fraction: None)
+        self.map_controller = MapController(self.grid_width, self.grid_height)
+        self.image_paths = []
+        self.entries = []
+        self.grass = []
+        self.enemies = []
+        self.ally = None
+
+    def generate(self):
+        grid_width, grid_height = self.grid_width, self.grid_height
+        self.create_ally()
+        for y in range(grid_height):
+            for x in range(grid_width):
+                self.map_controller.add_element(x, y, 'empty')
+        self.report(0.2)
+
+        self.create_bonfire()
+        self.create_river_with_bridge()
+        self.report(0.4)
+        self.create_walls()
+        self.report(0.7)
+        self.place_grass()
+        self.report(0.8)
+        self.create_enemies()
+        self.report(1.0)
+        return LevelDescriptor(self.level_number, self.seed, grid_width, grid_height, self.image_paths,
+                               np.array(self.entries, np.int32).reshape(-1, 4),
+                               np.array(self.grass, np.int32).reshape(-1, 3),
+                               np.array(self.enemies, np.int32).reshape(-1, 4),
+                               np.array(self.ally, np.int32),
+                               self.map_controller.codes())
+
+    def add_entry(self, kind, image_path, pos):
+        if image_path is None:
+            image = -1
+        elif image_path in self.image_paths:
+            image = self.image_paths.index(image_path)
+        else:
+            image = len(self.image_paths)
+            self.image_paths.append(image_path)
+        self.entries.append((kind, image, pos[0], pos[1]))
+
+    def choose_rank(self, thresholds):
+        # Determina o rank baseado em chances (limites acumulados para S, A, B, C; o resto é D)
+        chance = self.random.random()
+        for rank, threshold in enumerate(thresholds):
+            if chance < threshold:
+                return rank
+        return len(thresholds)
+
+    def create_ally(self):
+        ally_index = self.random.randrange(len(ally_data))
+        self.ally = (ally_index, self.choose_rank((0.3, 0.5, 0.7, 0.8)))
+
+    def create_enemies(self):
+        monster_count = len(monster_data)
+        # Retângulos já ocupados: pedras (colidíveis) e os inimigos já posicionados
+        rock_width, rock_height = image_size('images/map/rock.png')
+        taken = [pygame.Rect(x - rock_width, y - rock_height, rock_width, rock_height)
+                 for kind, image, x, y in self.entries if kind == ROCK]
+        for _ in range(self.num_enemies):
+            pos = self.free_position_near_bonfire(taken, buffer=3)
+            if pos is None:
+                continue
+            monster = self.random.randrange(monster_count)
+            rank = self.choose_rank((0.03, 0.08, 0.18, 0.33))
+            self.enemies.append((monster, rank, pos[0], pos[1]))
+            taken.append(pygame.Rect(pos[0] - ENEMY_FRAME // 2, pos[1] - ENEMY_FRAME // 2, ENEMY_FRAME // 2, ENEMY_FRAME // 2))
+
+    def free_position_near_bonfire(self, taken, buffer=2, max_attempts=100):
+        bonfire_pos = (self.grid_width // 2, self.grid_height // 2)
+        for _ in range(max_attempts):
+            x = bonfire_pos[0] + self.random.randint(-buffer, buffer) * TILE_SIZE
+            y = bonfire_pos[1] + self.random.randint(-buffer, buffer) * TILE_SIZE
+            rect = pygame.Rect(x, y, TILE_SIZE * 2, TILE_SIZE * 2)
+            if rect.collidelist(taken) == -1:
+                return x, y
+        return None
+
+    def create_walls(self):
+        grid_width, grid_height = self.grid_width, self.grid_height
+        rng = self.random
+        map_controller = self.map_controller
+        top_wall = bottom_wall = 1
+        for x in range(grid_width):
+            if x in ((grid_width // 2), (grid_width // 2) - 1, (grid_width // 2) + 1):
+                continue
+            for i in range(top_wall):
+                if rng.random() < 0.35 and map_controller.is_area_empty(x, i):
+                    self.create_tree(x, i)
+                    map_controller.add_element(x, i, 'tree')
+                    self.create_tree(x, grid_height + i)
+                    self.create_tree(x + grid_width, i)
+                    self.create_tree(x + grid_width, grid_height + i)
+                    self.create_tree(x - grid_width, i)
+                    self.create_tree(x - grid_width, grid_height + i)
+            for i in range(bottom_wall):
+                if rng.random() < 0.25 and map_controller.is_area_empty(x, grid_height - i - 1):
+                    self.create_tree(x, grid_height - i - 1)
+                    map_controller.add_element(x, grid_height - i - 1, 'tree')
+                    self.create_tree(x, -i - 1)
+                    self.create_tree(x + grid_width, grid_height - i - 1)
+                    self.create_tree(x + grid_width, -i - 1)
+                    self.create_tree(x - grid_width, grid_height - i - 1)
+                    self.create_tree(x - grid_width, -i - 1)
+
+            top_wall = self.adjust_wall_thickness(top_wall)
+            bottom_wall = self.adjust_wall_thickness(bottom_wall)
+            open_area_start = top_wall
+            open_area_end = grid_height - bottom_wall
+
+            if rng.random() < 0.9:
+                if open_area_start < open_area_end and map_controller.is_area_empty(x, open_area_start):
+                    y = rng.randint(open_area_start, open_area_end - 1)
+                    map_controller.add_element(x, y, 'tree')
+                    for dx, dy in self.mirrors():
+                        self.create_tree(x + dx, y + dy)
+
+                    y = rng.randint(open_area_start, open_area_end - 1)
+                    map_controller.add_element(x, y, 'rock')
+                    for dx, dy in self.mirrors():
+                        self.create_rock(x + dx, y + dy)
+
+    def mirrors(self):
+        # A própria posição e as 8 cópias nos mapas vizinhos
+        w, h = self.grid_width, self.grid_height
+        return ((0, 0), (w, 0), (-w, 0), (0, h), (0, -h), (w, -h), (-w, h), (w, h), (-w, -h))
+
+    def adjust_wall_thickness(self, wall_thickness):
+        if self.random.random() < 0.5:
+            return max(1, wall_thickness - 1)
+        else:
+            return wall_thickness + 1
+
+    def in_bounds(self, x, y):
+        return not (x < -20 or x > (self.grid_width + 20) or y < -15 or y > (self.grid_height + 15))
+
+    def create_rock(self, x, y):
+        if self.in_bounds(x, y):
+            self.add_entry(ROCK, 'images/map/rock.png', (x * TILE_SIZE, y * TILE_SIZE))
+
+    def create_tree(self, x, y):
+        if not self.in_bounds(x, y):
+            return
+        tree_type = self.random.choice(list(tree_data.keys()))
+        trunk_image_path = tree_data[tree_type]['trunk_path']
+        overlay_image_path = tree_data[tree_type]['overlay_path']
+
+        # Verifique se os arquivos de imagem existem
+        if not os.path.exists(trunk_image_path):
+            print(f"File not found: {trunk_image_path}")
+            return
+        if not os.path.exists(overlay_image_path):
+            print(f"File not found: {overlay_image_path}")
+            return
+        pos = (x * TILE_SIZE, y * TILE_SIZE)
+        self.add_entry(TRUNK, trunk_image_path, pos)
+        self.add_entry(OVERLAY, overlay_image_path, pos)
+
+    def create_bonfire(self):
+        # O grid não muda entre as tentativas: procura as áreas vazias uma vez só
+        empty_areas = self.map_controller.find_empty_areas()
+        if not any(x > self.grid_width // 2 for x, y in empty_areas):
+            print("No empty areas found for bonfire.")
+            return
+        while True:
+            bonfire_pos = self.random.choice(empty_areas)
+            if bonfire_pos[0] > self.grid_width // 2:
+                break
+        bonfire_x = bonfire_pos[0] * TILE_SIZE
+        bonfire_y = bonfire_pos[1] * TILE_SIZE
+        map_width = self.grid_width * TILE_SIZE
+        map_height = self.grid_height * TILE_SIZE
+        for dx, dy in ((0, 0), (map_width, 0), (-map_width, 0), (0, map_height), (0, -map_height)):
+            self.add_entry(BONFIRE, None, (bonfire_x + dx, bonfire_y + dy))
+        self.map_controller.add_element(bonfire_pos[0], bonfire_pos[1], 'bonfire')
+
+    def create_river_with_bridge(self):
+        grid_height = self.grid_height
+        river_x = self.grid_width // 2
+
+        for y in range(-9, grid_height + 9):
+            # Create river tiles
+            self.add_entry(RIVER, 'images/map/river1.png', (river_x * TILE_SIZE, y * TILE_SIZE))
+            self.add_entry(RIVER, 'images/map/river2.png', ((river_x + 1) * TILE_SIZE, y * TILE_SIZE))
+            self.map_controller.add_element(river_x, y, 'river')
+            self.map_controller.add_element(river_x + 1, y, 'river')
+            for i in range(-22, 22, 4):
+                self.add_entry(WATER, None, ((river_x * TILE_SIZE) - i, y * TILE_SIZE))
+
+        # Create bridge
+        bridge_y = grid_height // 2
+        for x in range(river_x + 4, river_x + 5):
+            self.add_entry(BRIDGE, 'images/map/bridge.png', (x * TILE_SIZE, bridge_y * TILE_SIZE))
+            self.map_controller.add_rect(x, bridge_y, 8, 5, 'bridge')
+
+    def place_grass(self):
+        grass_probability = 0.1
+        for x, y in self.map_controller.find_elements_of_type('empty'):
+            if self.random.random() < grass_probability:
+                density = self.random.randint(2, 5)
+                self.grass.append((x, y, density))
+                self.map_controller.add_element(x, y, 'grass')
+
+
+_image_sizes = {}
+
+
+def image_size(image_path):
+    # Só o tamanho: carregar sem convert() não precisa da janela e funciona em qualquer thread
+    size = _image_sizes.get(image_path)
+    if size is None:
+        size = _image_sizes[image_path] = pygame.image.load(image_path).get_size()
+    return size
+
+
+def user_data_dir():
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'ShinobiOffline')
+    if sys.platform == 'darwin':
+        return os.path.expanduser('~/Library/Application Support/ShinobiOffline')
+    base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(base, 'shinobi-offline')
+
+
+def settings_fingerprint(level_number):
+    # Mudar as tabelas que o gerador lê muda o layout: entra no nome do arquivo do cache
+    level_info = level_data.get(level_number, level_data[1])
+    text = repr((level_info, tree_data, list(monster_data), list(ally_data)))
+    return zlib.crc32(text.encode())
+
+
+def cache_dir():
+    return os.environ.get(LEVEL_CACHE_ENV) or LEVEL_CACHE_DIR or os.path.join(user_data_dir(), 'levels')
+
+
+def cache_enabled():
+    # Lido a cada chamada: headless/CI desligam com SHINOBI_LEVEL_CACHE=off sem mexer no settings
+    return LEVEL_CACHE and os.environ.get(LEVEL_CACHE_ENV, '').lower() not in ('0', 'off')
+
+
+def descriptor_path(level_number, seed):
+    name = f"level{level_number}-{seed}-v{DESCRIPTOR_VERSION}-{settings_fingerprint(level_number):08x}.npz"
+    return os.path.join(cache_dir(), name)
+
+
+def prune_cache(limit):
+    # Cada partida sorteia sementes novas: sem limite a pasta só cresceria
+    directory = cache_dir()
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.npz')]
+    if len(paths) <= limit:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:len(paths) - limit]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def generate_descriptor(level_number, seed=None, report=None):
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    return LevelGenerator(level_number, seed, report).generate()
+
+
+def load_descriptor(level_number, seed=None, report=None):
+    """Descriptor for (level_number, seed): from the on-disk cache when it is there,
+    otherwise generated and written to the cache (when caching is on). Without a seed
+    a random one is drawn and nothing is written, since no one can ask for it again."""
+    if seed is None:
+        return generate_descriptor(level_number, random.randrange(2 ** 32), report)
+    if not cache_enabled():
+        return generate_descriptor(level_number, seed, report)
+    path = descriptor_path(level_number, seed)
+    if os.path.exists(path):
+        try:
+            descriptor = LevelDescriptor.load(path)
+            os.utime(path)  # usado agora: fica entre os mais novos na hora de apagar
+            if report:
+                report(1.0)
+            return descriptor
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as error:
+            print(f"Ignoring level cache {path}: {error}")
+    descriptor = generate_descriptor(level_number, seed, report)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor.save(path)
+        prune_cache(LEVEL_CACHE_FILES)
+    except OSError as error:
+        print(f"Could not write level cache {path}: {error}")
+    return descriptor
+
+
+class LevelPreparation:
+    """Loads or generates a level descriptor on a worker thread; the main thread polls `done`.
+
+    `progress` goes from 0 to 1 while the descriptor is generated. result() waits for
+    the thread and returns the LevelDescriptor (or re-raises the worker's exception).
+    """
+
+    def __init__(self, level_number, seed=None):
+        self.level_number = level_number
+        self.seed = seed  # None: semente sorteada em load_descriptor, sem passar pelo cache
+        self.progress = 0.0
+        self.descriptor = None
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name=f"level-{level_number}", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        try:
+            self.descriptor = load_descriptor(self.level_number, self.seed, self.report)
+        except Exception as error:
+            self.error = error
+        self.progress = 1.0
+
+    def report(self, fraction):
+        self.progress = fraction
+
+    @property
+    def done(self):
+        return not self.thread.is_alive()
+
+    def result(self):
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.descriptor
@@ -0,0 +1,103 @@
+import math
+import numpy as np
+import pygame
+
+
+class LightMap:
+    """Day/night darkness for the screen, with holes cut by the registered lights.
+
+    Sprites join with add(sprite, radius, color) and leave with remove(sprite); a
+    sprite that is no longer in any group leaves on its own at the next draw, day or
+    night. Every frame the map, which has the size of the screen, is filled with the
+    night alpha and each light whose circle touches the view subtracts a radial
+    gradient. Gradients are built once per (radius, color) with NumPy and blitted as
+    they are.
+    """
+
+    def __init__(self, size):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.lights = {}  # sprite -> (radius, color)
+        self.gradients = {}
+
+    def add(self, sprite, radius, color=(255, 200, 100)):
+        self.lights[sprite] = (int(radius), color)
+
+    def remove(self, sprite):
+        self.lights.pop(sprite, None)
+
+    def __len__(self):
+        return len(self.lights)
+
+    def gradient(self, radius, color):
+        key = (radius, color)
+        surface = self.gradients.get(key)
+        if surface is None:
+            diameter = radius * 2
+            surface = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+            x, y = np.meshgrid(np.arange(diameter), np.arange(diameter), indexing='ij')
+            distance = np.hypot(x - radius, y - radius)
+            inside = distance <= radius
+            # Queda quadrática, concentrada no centro
+            intensity = np.where(inside, np.clip(1 - (distance / radius) ** 2, 0, 1) ** 1.5, 0)
+            pixels = pygame.surfarray.pixels3d(surface)
+            pixels[inside] = color
+            del pixels
+            alpha = pygame.surfarray.pixels_alpha(surface)
+            alpha[...] = (150 * intensity).astype(np.uint8)
+            del alpha
+            self.gradients[key] = surface
+        return surface
+
+    def prune(self):
+        # Sprites mortos saem do registro a cada quadro, mesmo de dia (quando nada é desenhado)
+        dead = [sprite for sprite in self.lights if not sprite.alive()]
+        for sprite in dead:
+            del self.lights[sprite]
+
+    def visible_lights(self, camera):
+        view = camera.get_visible_rect()
+        for sprite, (radius, color) in self.lights.items():
+            x, y = sprite.rect.center
+            if x + radius > view.left and x - radius < view.right and y + radius > view.top and y - radius < view.bottom:
+                yield sprite, radius, color
+
+    def draw(self, screen, camera, night_alpha):
+        self.prune()
+        if night_alpha <= 0:
+            return  # de dia a máscara é toda transparente
+        surface = self.surface
+        surface.fill((0, 0, 0, night_alpha))
+        offset_x, offset_y = camera.camera.topleft
+        blits = []
+        for sprite, radius, color in self.visible_lights(camera):
+            x, y = sprite.rect.center
+            position = (int(x + offset_x - radius), int(y + offset_y - radius))
+            blits.append((self.gradient(radius, color), position, None, pygame.BLEND_RGBA_SUB))
+        if blits:
+            surface.blits(blits, doreturn=False)
+        screen.blit(surface, (0, 0))
+
+
+def night_alpha(time_of_day, day_length):
+    # Curva senoidal: 0 no início do ciclo, 190 na metade
+    day_progress = time_of_day / day_length
+    return int(95 * (math.sin(2 * math.pi * day_progress - math.pi / 2) + 1))
+
+
+_lighting = None
+
+
+def set_lighting(lighting):
+    """Mapa de luz que recebe as luzes dos sprites criados (o Level atual)."""
+    global _lighting
+    _lighting = lighting
+
+
+def add_light(sprite, radius, color=(255, 200, 100)):
+    if _lighting is not None:
+        _lighting.add(sprite, radius, color)
+
+
+def remove_light(sprite):
+    if _lighting is not None:
+        _lighting.remove(sprite)
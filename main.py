@@ -4,21 +4,15 @@ from player import Player
 from settings import *
 from level import Level
 from button import *
-from enum import Enum
-from key_pressed_notifier import KeyPressedNotifier
+from presentation import Presenter, scale_surface
+from scenes import *
+from level_gen import LevelPreparation
+from audio import load_sounds
+from event_bus import events
+from text_display import get_font, render_text
 import random
 import math
-
-class GameState(Enum):
-    MENU = 1
-    VILLAGE = 2
-    PLAYING = 3
-    MISSION_COMPLETE = 4
-    GAME_OVER = 5
-    PAUSED = 6
-    OFFICE = 7
-    SHOP = 8
-    BARRACKS = 9
+import time
 
 class ZoomingWindEffect(pygame.sprite.Sprite):
     def __init__(self, center, groups, screen_width, screen_height):
@@ -65,10 +59,10 @@ class Game:
         pygame.init()
         self.window = pygame.display.set_mode((WIDTH, HEIGHT))  # , pygame.FULLSCREEN
         pygame.display.set_caption('Shinobi Offline')
+        self.sounds = load_sounds()  # todos os sons decodificados uma vez, antes do primeiro nível
         self.running = True
-        self.state = GameState.MENU
         self.level = None
-        self.font = pygame.font.Font(None, 74)
+        self.font = get_font(None, 74)
         self.level_number = 1
         self.menu_background = pygame.image.load('images/mainmenu.png').convert()
         self.village_background = pygame.image.load('images/map/konoha/village_background.png').convert()
@@ -89,14 +83,19 @@ class Game:
         self.GAME_WIDTH, self.GAME_HEIGHT = WIDTH // 2, HEIGHT // 2  # The game's internal resolution
         self.ZOOM_FACTOR = 2  # Adjust this to change the zoom level
         self.game_surface = pygame.Surface((self.GAME_WIDTH, self.GAME_HEIGHT))
+        self.presenter = Presenter(self.window, (self.GAME_WIDTH, self.GAME_HEIGHT), self.ZOOM_FACTOR)
 
-        self.pause_buttons = {
-            'resume': Button(self.GAME_WIDTH // 2 - 100, self.GAME_HEIGHT // 2, 200, 50, "Resume", 'green'),
-            'quit': Button(self.GAME_WIDTH // 2 - 100, self.GAME_HEIGHT // 2 + 60, 200, 50, "Quit to Menu", 'red')
-        }
+        # Fundos já na resolução interna: escalados uma vez aqui, não a cada quadro
+        game_size = (self.GAME_WIDTH, self.GAME_HEIGHT)
+        self.menu_background = scale_surface(self.menu_background, game_size)
+        self.village_background = scale_surface(self.village_background, game_size)
+        self.office_inside = scale_surface(self.office_inside, game_size)
+        self.shop_inside = scale_surface(self.shop_inside, game_size)
+        self.barracks_inside = scale_surface(self.barracks_inside, game_size)
 
         self.current_mission = None
         self.mission_level_index = 0
+        self.preparations = {}  # level_number -> LevelPreparation gerando em outra thread
         self.mission_buttons = {}
         self.player = None
         self.create_default_player()
@@ -104,6 +103,13 @@ class Game:
         # Add this line after initializing self.game_surface
         self.wind_effect = ZoomingWindEffect((self.GAME_WIDTH // 2, self.GAME_HEIGHT // 2), [], self.GAME_WIDTH, self.GAME_HEIGHT)
 
+        # Telas criadas uma vez só: botões e fundos continuam prontos entre as visitas
+        scenes = (MenuScene(self), VillageScene(self), OfficeScene(self), ShopScene(self), BarracksScene(self),
+                  LoadingScene(self), PlayingScene(self), PauseScene(self), MissionCompleteScene(self), GameOverScene(self))
+        self.scenes = {scene.state: scene for scene in scenes}
+        self.stack = []
+        self.switch(GameState.MENU)
+
     def pixel_perfect_collision(self, surface, pos):
         try:
             mask = pygame.mask.from_surface(surface)
@@ -118,389 +124,146 @@ class Game:
         self.player = Player((0, 0), [], [], [], dummy_level)
         # No need to set gold here, as it's initialized in the Player class
 
-    def show_mission_complete_screen(self):
-        self.game_surface.fill('black')
-        self.draw_text('Mission Complete!', 48, self.GAME_WIDTH // 2, self.GAME_HEIGHT // 2 - 50)
-        self.draw_text(f'Gold earned: {self.current_mission["gold_reward"]}', 24, self.GAME_WIDTH // 2, self.GAME_HEIGHT // 2 + 50)
-        self.draw_text('Press any key to continue', 24, self.GAME_WIDTH // 2, self.GAME_HEIGHT // 2 + 100)
-        self.apply_zoom()
-        pygame.display.flip()
-        self.wait_for_keypress(self.return_to_village)
+    def release_player(self):
+        # O jogador atual (do nível ou o dummy) para de ouvir o teclado antes de ser substituído
+        if self.player:
+            events.close_scope(self.player.level)
+
+    @property
+    def scene(self):
+        return self.stack[-1]
+
+    @property
+    def state(self):
+        return self.scene.state
+
+    def push(self, state):
+        # Empilha uma tela por cima da atual (ex.: pausa sobre o jogo)
+        if self.stack:
+            self.scene.exit()
+        self.stack.append(self.scenes[state])
+        self.scene.enter()
+
+    def pop(self):
+        self.stack.pop().exit()
+        self.scene.enter()
+
+    def switch(self, state):
+        # Troca a pilha inteira pela tela pedida
+        while self.stack:
+            self.stack.pop().exit()
+        self.stack.append(self.scenes[state])
+        self.scene.enter()
+
+    def quit(self):
+        self.running = False
+        pygame.quit()
+        sys.exit()
 
-    def return_to_village(self):
-        self.state = GameState.VILLAGE
+    def run(self):
+        # Loop único: um clock, um lugar para limitar quadros e medir o tempo de cada um
+        clock = pygame.time.Clock()
+        dirty = True
+        while self.running:
+            scene = self.scene
+            dt = clock.tick(scene.fps) / 1000.0
+            pg_events = pygame.event.get()
+            if not pg_events and not (scene.animated or dirty):
+                pg_events = [pygame.event.wait(1000)]  # tela estática: dorme até o próximo evento
+            frame_start = time.perf_counter()
+            for event in pg_events:
+                if event.type == pygame.NOEVENT:
+                    continue
+                if event.type == pygame.QUIT:
+                    self.quit()
+                dirty = True
+                self.scene.handle_event(event)
+            if self.scene is not scene:
+                dirty = True  # a tela nova desenha no próximo quadro
+                continue
+            scene.update(dt)
+            if self.scene is not scene:
+                dirty = True
+                continue
+            if scene.animated or dirty:
+                scene.render(self.game_surface)
+                self.apply_zoom()
+                pygame.display.flip()
+                dirty = False
+            scene.frame_done((time.perf_counter() - frame_start) * 1000)
+
+    def prepare_level(self, level_number):
+        # Começa a gerar o layout em segundo plano (ou devolve a geração já em andamento)
+        preparation = self.preparations.get(level_number)
+        if preparation is None:
+            preparation = self.preparations[level_number] = LevelPreparation(level_number)
+        return preparation
 
     def start_next_level(self):
         if self.current_mission and self.mission_level_index < len(self.current_mission['levels']):
             level_number = self.current_mission['levels'][self.mission_level_index]
-            player_state = self.player.save_state() if self.player else None
-            self.level = Level(self.game_surface, level_number, player_state)
-            self.player = self.level.player  # Update the game's player reference
-            self.state = GameState.PLAYING
             self.mission_level_index += 1
+            self.scenes[GameState.LOADING].preparation = self.prepare_level(level_number)
+            self.switch(GameState.LOADING)
         else:
             self.complete_mission()
 
+    def bind_level(self, preparation):
+        # Parte curta, na thread principal: sprites e imagens a partir do descritor pronto
+        self.preparations.pop(preparation.level_number, None)
+        player_state = self.player.save_state() if self.player else None
+        self.release_player()
+        self.level = Level(self.game_surface, preparation.level_number, player_state, descriptor=preparation.result())
+        self.player = self.level.player  # Update the game's player reference
+        self.switch(GameState.PLAYING)
+        if self.mission_level_index < len(self.current_mission['levels']):
+            self.prepare_level(self.current_mission['levels'][self.mission_level_index])
+
     def complete_mission(self):
         if self.current_mission:
             self.player.gold += self.current_mission['gold_reward']
-            self.show_mission_complete_screen()
-        self.current_mission = None
-        self.state = GameState.VILLAGE
+            self.scenes[GameState.MISSION_COMPLETE].gold_reward = self.current_mission['gold_reward']
+            self.current_mission = None
+            self.switch(GameState.MISSION_COMPLETE)
+        else:
+            self.switch(GameState.VILLAGE)
+
+    def start_mission(self, mission_id):
+        self.current_mission = mission_data[mission_id]
+        self.mission_level_index = 0
+        self.start_next_level()
 
     def reset(self):
         player_state = self.level.player.save_state() if self.level else None
         self.level_number += 1
+        self.release_player()
         self.level = Level(self.game_surface, self.level_number)
-        self.state = GameState.PLAYING
-
-    def show_game_over_screen(self):
-        self.game_surface.fill('black')
-        game_over_text = self.font.render("You are dead.", True, (255, 255, 255))
-        self.game_surface.blit(game_over_text, (self.GAME_WIDTH // 2 - game_over_text.get_width() // 2, self.GAME_HEIGHT // 2 - game_over_text.get_height() // 2))
-        
-        restart_button = Button(self.GAME_WIDTH // 2 - 100, self.GAME_HEIGHT // 2 + 100, 200, 50, "Restart", 'green')
-        quit_button = Button(self.GAME_WIDTH // 2 - 100, self.GAME_HEIGHT // 2 + 160, 200, 50, "Quit to Menu", 'red')
-        
-        while self.state == GameState.GAME_OVER:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    scaled_pos = (event.pos[0] // self.ZOOM_FACTOR, event.pos[1] // self.ZOOM_FACTOR)
-                    #if restart_button.is_clicked(scaled_pos):
-                    #    self.reset_game()
-                    #    self.state = GameState.PLAYING
-                    if quit_button.is_clicked(scaled_pos):
-                        self.reset_game()
-                        self.state = GameState.MENU
-
-            #restart_button.draw(self.game_surface)
-            quit_button.draw(self.game_surface)
-            self.apply_zoom()
-            pygame.display.flip()
+        self.switch(GameState.PLAYING)
 
     def reset_game(self):
         self.level_number = 1
         self.mission_level_index = 0
         self.current_mission = None
-        self.state = GameState.MENU
+        self.preparations.clear()
+        self.release_player()
         self.create_default_player()  # Reset the player to default state
         if self.level:
             self.level.reset()  # Add a reset method to your Level class
         # Reset any other game state variables as needed
-
-    def run(self):
-        while self.running:
-            if self.state == GameState.MENU:
-                self.show_menu()
-            elif self.state == GameState.VILLAGE:
-                self.show_village()
-            elif self.state == GameState.PLAYING:
-                self.playing()
-            elif self.state == GameState.MISSION_COMPLETE:
-                self.show_mission_complete_screen()
-            elif self.state == GameState.GAME_OVER:
-                self.show_game_over_screen()
-            elif self.state == GameState.PAUSED:
-                self.handle_pause()
-            elif self.state in [GameState.OFFICE, GameState.SHOP, GameState.BARRACKS]:
-                self.show_building_interior(self.state)
-
-    def wait_for_keypress(self, action):
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                    waiting = False
-                    action()
-
-    def show_menu(self):
-        # Calculate new y-positions (15% lower)
-        start_y = int(self.GAME_HEIGHT * 0.65)  # 65% down the screen instead of 50%
-        quit_y = start_y + 60  # Keep the same spacing between buttons
-
-        start_game_button = Button(self.GAME_WIDTH // 2 - 100, start_y, 200, 50, "Start Game", 'green')
-        quit_button = Button(self.GAME_WIDTH // 2 - 100, quit_y, 200, 50, "Quit", 'red')
-        
-        clock = pygame.time.Clock()
-        
-        while self.state == GameState.MENU:
-            dt = clock.tick(60) / 1000.0  # Get delta time in seconds
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    scaled_pos = (event.pos[0] // self.ZOOM_FACTOR, event.pos[1] // self.ZOOM_FACTOR)
-                    if start_game_button.is_clicked(scaled_pos):
-                        self.state = GameState.VILLAGE
-                    elif quit_button.is_clicked(scaled_pos):
-                        self.running = False
-                        pygame.quit()
-                        sys.exit()
-
-            self.game_surface.blit(pygame.transform.scale(self.menu_background, (self.GAME_WIDTH, self.GAME_HEIGHT)), (0, 0))
-            
-            # Update and draw the wind effect
-            self.wind_effect.update(dt)
-            self.game_surface.blit(self.wind_effect.image, (0, 0))
-            
-            self.draw_text('Shinobi Offline', 48, self.GAME_WIDTH // 2, self.GAME_HEIGHT // 4)
-            start_game_button.draw(self.game_surface)
-            quit_button.draw(self.game_surface)
-            self.apply_zoom()
-            pygame.display.flip()
+        self.switch(GameState.MENU)
 
     def draw_text(self, text, size, x, y, color=(255, 255, 255)):
-        font = pygame.font.Font(None, size)
-        text_surface = font.render(text, True, color)
+        text_surface = render_text(text, size, color)
         text_rect = text_surface.get_rect()
         text_rect.midtop = (x, y)
         self.game_surface.blit(text_surface, text_rect)
 
-    def playing(self):
-        while self.state == GameState.PLAYING:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    pygame.quit()
-                    sys.exit()
-
-                if event.type == pygame.KEYDOWN:
-                    KeyPressedNotifier.notify(event.key)
-                    if event.key == pygame.K_ESCAPE:
-                        self.state = GameState.PAUSED
-                        self.show_pause_menu()
-
-            self.game_surface.fill('white')
-            self.level.run(self.game_surface)
-            self.apply_zoom()
-            pygame.display.update()
-
-            if self.level.player.hp <= 0:
-                self.state = GameState.GAME_OVER
-                break  # Exit the playing loop to show the game over screen
-
-            if self.level.enemy_count == 0 and self.level.player.rect.right >= self.level.get_map_rect().right - 64:
-                if self.mission_level_index < len(self.current_mission['levels']):
-                    self.start_next_level()
-                else:
-                    self.complete_mission()
-
     def apply_zoom(self):
-        scaled_surface = pygame.transform.scale(self.game_surface, (self.GAME_WIDTH * self.ZOOM_FACTOR, self.GAME_HEIGHT * self.ZOOM_FACTOR))
-        self.window.blit(scaled_surface, ((WIDTH - self.GAME_WIDTH * self.ZOOM_FACTOR) // 2, 
-                                          (HEIGHT - self.GAME_HEIGHT * self.ZOOM_FACTOR) // 2))
-
-    def show_village(self):
-        while self.state == GameState.VILLAGE:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    scaled_pos = (mouse_pos[0] // self.ZOOM_FACTOR, mouse_pos[1] // self.ZOOM_FACTOR)
-                    
-                    # Divide the screen into three vertical sections
-                    if scaled_pos[0] < self.GAME_WIDTH // 3:
-                        self.state = GameState.BARRACKS
-                    elif scaled_pos[0] < (self.GAME_WIDTH * 2) // 3:
-                        self.state = GameState.OFFICE
-                    else:
-                        self.state = GameState.SHOP
-
-            self.game_surface.blit(pygame.transform.scale(self.village_background, (self.GAME_WIDTH, self.GAME_HEIGHT)), (0, 0))
-            
-            # Draw building images
-            for building, image in self.buildings.items():
-                if building == 'office':
-                    self.game_surface.blit(image, (self.GAME_WIDTH // 3, 0))
-                else:
-                    self.game_surface.blit(image, (0, 0))
-
-            # Highlight the section the mouse is over
-            mouse_pos = pygame.mouse.get_pos()
-            scaled_pos = (mouse_pos[0] // self.ZOOM_FACTOR, mouse_pos[1] // self.ZOOM_FACTOR)
-            highlight_rect = pygame.Rect(0, 0, self.GAME_WIDTH // 3, self.GAME_HEIGHT)
-            
-            if scaled_pos[0] < self.GAME_WIDTH // 3:
-                highlight_rect.left = 0
-            elif scaled_pos[0] < (self.GAME_WIDTH * 2) // 3:
-                highlight_rect.left = self.GAME_WIDTH // 3
-            else:
-                highlight_rect.left = (self.GAME_WIDTH * 2) // 3
-
-            pygame.draw.rect(self.game_surface, (255, 255, 0, 100), highlight_rect, 3)  # Yellow outline
-
-            self.draw_text(f"Gold: {self.player.gold}", 24, self.GAME_WIDTH - 100, 50, color=(255, 215, 0))
-            self.apply_zoom()
-            pygame.display.flip()
-
-        if self.state in [GameState.OFFICE, GameState.SHOP, GameState.BARRACKS]:
-            self.show_building_interior(self.state)
-
-    def start_mission(self, mission_id):
-        self.current_mission = mission_data[mission_id]
-        self.mission_level_index = 0
-        self.start_next_level()
-
-    def show_building_interior(self, building_state):
-        if building_state == GameState.OFFICE:
-            self.show_office()
-        elif building_state == GameState.SHOP:
-            self.show_shop()
-        elif building_state == GameState.BARRACKS:
-            self.show_barracks()
-
-    def show_office(self):
-        back_button = Button(50, self.GAME_HEIGHT - 70, 100, 50, "Back", 'red')
-        mission_buttons = {}
-        y_offset = 100
-        for mission_id, mission in mission_data.items():
-            button = Button(self.GAME_WIDTH // 2 - 150, y_offset, 300, 50, f"Mission {mission_id}: {mission['name']}", 'blue')
-            mission_buttons[mission_id] = button
-            y_offset += 60
-
-        while self.state == GameState.OFFICE:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    scaled_pos = (event.pos[0] // self.ZOOM_FACTOR, event.pos[1] // self.ZOOM_FACTOR)
-                    if back_button.is_clicked(scaled_pos):
-                        self.state = GameState.VILLAGE
-                    for mission_id, button in mission_buttons.items():
-                        if button.is_clicked(scaled_pos):
-                            self.start_mission(mission_id)
-
-            self.game_surface.blit(pygame.transform.scale(self.office_inside, (self.GAME_WIDTH, self.GAME_HEIGHT)), (0, 0))
-            for button in mission_buttons.values():
-                button.draw(self.game_surface)
-            back_button.draw(self.game_surface)
-            self.draw_text("Available Missions", 36, self.GAME_WIDTH // 2, 50)
-            self.apply_zoom()
-            pygame.display.flip()
-
-    def show_shop(self):
-        back_button = Button(50, self.GAME_HEIGHT - 70, 100, 50, "Back", 'red')
-        weapon_buttons = {}
-        y_offset = 100
-        for weapon_name, weapon_info in weapon_data.items():
-            if weapon_info.get('type') in ['melee', 'ranged']:  # Only show melee and ranged weapons
-                price = weapon_info.get('price', 100)  # Default price if not specified
-                button = Button(self.GAME_WIDTH // 2 - 150, y_offset, 300, 50, f"Buy {weapon_name.capitalize()} ({price} gold)", 'green')
-                weapon_buttons[weapon_name] = button
-                y_offset += 60
-
-        while self.state == GameState.SHOP:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    scaled_pos = (event.pos[0] // self.ZOOM_FACTOR, event.pos[1] // self.ZOOM_FACTOR)
-                    if back_button.is_clicked(scaled_pos):
-                        self.state = GameState.VILLAGE
-                    for weapon_name, button in weapon_buttons.items():
-                        if button.is_clicked(scaled_pos):
-                            price = weapon_data[weapon_name].get('price', 100)
-                            if self.player.gold >= price:
-                                self.player.gold -= price
-                                # Add weapon to player's inventory (you'll need to implement this)
-                                print(f"Bought {weapon_name}")  # Placeholder for inventory addition
-
-            self.game_surface.blit(pygame.transform.scale(self.shop_inside, (self.GAME_WIDTH, self.GAME_HEIGHT)), (0, 0))
-            for button in weapon_buttons.values():
-                button.draw(self.game_surface)
-            back_button.draw(self.game_surface)
-            self.draw_text("Weapon Shop", 36, self.GAME_WIDTH // 2, 50)
-            self.draw_text(f"Gold: {self.player.gold}", 24, self.GAME_WIDTH - 100, 50, color=(255, 215, 0))
-            self.apply_zoom()
-            pygame.display.flip()
-
-    def show_barracks(self):
-        back_button = Button(50, self.GAME_HEIGHT - 70, 100, 50, "Back", 'red')
-        ally_buttons = {}
-        y_offset = 100
-        for ally_name, ally_info in ally_data.items():
-            price = ally_info.get('price', 200)  # Default price if not specified
-            button = Button(self.GAME_WIDTH // 2 - 150, y_offset, 300, 50, f"Hire {ally_name} ({price} gold)", 'gold')
-            ally_buttons[ally_name] = button
-            y_offset += 60
-
-        while self.state == GameState.BARRACKS:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    scaled_pos = (event.pos[0] // self.ZOOM_FACTOR, event.pos[1] // self.ZOOM_FACTOR)
-                    if back_button.is_clicked(scaled_pos):
-                        self.state = GameState.VILLAGE
-                    for ally_name, button in ally_buttons.items():
-                        if button.is_clicked(scaled_pos):
-                            price = ally_data[ally_name].get('price', 200)
-                            if self.player.gold >= price:
-                                self.player.gold -= price
-                                # Add ally to player's team (you'll need to implement this)
-                                print(f"Hired {ally_name}")  # Placeholder for ally addition
-
-            self.game_surface.blit(pygame.transform.scale(self.barracks_inside, (self.GAME_WIDTH, self.GAME_HEIGHT)), (0, 0))
-            for button in ally_buttons.values():
-                button.draw(self.game_surface)
-            back_button.draw(self.game_surface)
-            self.draw_text("Mercenary Barracks", 36, self.GAME_WIDTH // 2, 50)
-            self.draw_text(f"Gold: {self.player.gold}", 24, self.GAME_WIDTH - 100, 50, color=(255, 215, 0))
-            self.apply_zoom()
-            pygame.display.flip()
-
-    def show_pause_menu(self):
-        pause_surface = pygame.Surface((self.GAME_WIDTH, self.GAME_HEIGHT), pygame.SRCALPHA)
-        pause_surface.fill((0, 0, 0, 128))
-        self.game_surface.blit(pause_surface, (0, 0))
-        
-        for button in self.pause_buttons.values():
-            button.draw(self.game_surface)
-        
-        self.apply_zoom()
-        pygame.display.flip()
-
-    def handle_pause(self):
-        while self.state == GameState.PAUSED:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    scaled_pos = (event.pos[0] // self.ZOOM_FACTOR, event.pos[1] // self.ZOOM_FACTOR)
-                    if self.pause_buttons['resume'].is_clicked(scaled_pos):
-                        self.state = GameState.PLAYING
-                    elif self.pause_buttons['quit'].is_clicked(scaled_pos):
-                        self.state = GameState.MENU
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.state = GameState.PLAYING
-
-            self.show_pause_menu()
+        self.presenter.present(self.game_surface)
 
 def main():
     game = Game()
     game.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
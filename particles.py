@@ -0,0 +1,374 @@
+import random
+import numpy as np
+import pygame
+from settings import *
+
+# Tipos de partícula (comportamentos dos antigos sprites de effects.py)
+PARTICLE = 0  # Particle: explode, encolhe e escurece
+TRAIL = 1     # ParticleTrail: parado, encolhe e some
+SMOKE = 2     # FireSmoke: sobe, cresce e some
+BLOOD = 3     # BloodParticle: voa, para, cresce e desbota
+EMBER = 4     # FireRemains: quadradinho que sobe na diagonal e some
+WATER = 5     # WaterParticle: quadradinho que desce o rio trocando de tom de azul
+
+FADE_LEVELS = 32  # Quantização de cor/alpha dos carimbos
+WATER_SHADES = [(100, 100, 250), (50, 100, 250), (50, 150, 250), (50, 180, 250)]
+
+# Prioridades no orçamento de partículas: as mais baixas são cortadas primeiro
+AMBIENT = 0  # rio, fogueiras, brasas
+EFFECT = 1   # rastros de projéteis e jutsus
+COMBAT = 2   # sangue e impactos
+
+
+class ParticleBudget:
+    """Shared cap on live particles, consulted before every emission.
+
+    allow() decides whether one more particle may be emitted at `pos`:
+      - each priority may only fill its share of the cap, so ambient emitters
+        (river, bonfires) stop first and combat effects last;
+      - inside the view everything is emitted; up to PARTICLE_LOD_NEAR px outside
+        only a fraction is, and farther away ambient emitters stop entirely;
+      - the cap follows the measured frame time (adapt()): it shrinks while frames
+        take longer than the target and grows back slowly when there is room.
+    """
+
+    SHARES = {AMBIENT: 0.5, EFFECT: 0.85, COMBAT: 1.0}
+    LOD = {AMBIENT: (1.0, 0.25, 0.0), EFFECT: (1.0, 0.5, 0.1), COMBAT: (1.0, 1.0, 0.5)}  # dentro, perto, longe
+
+    def __init__(self, cap=PARTICLE_BUDGET, limits=PARTICLE_BUDGET_RANGE, near=PARTICLE_LOD_NEAR,
+                 target_ms=1000 / (RENDER_FPS or FPS)):
+        self.cap = cap
+        self.min_cap, self.max_cap = limits
+        self.near = near
+        self.target_ms = target_ms
+        self.frame_ms = target_ms
+        self.view = None
+        self.credit = {}
+        self.granted = 0
+        self.denied = 0
+
+    def set_view(self, view):
+        self.view = view
+
+    def band(self, pos):
+        view = self.view
+        if view is None:
+            return 0
+        x, y = pos
+        distance = max(view.left - x, x - view.right, view.top - y, y - view.bottom)
+        if distance <= 0:
+            return 0
+        return 1 if distance <= self.near else 2
+
+    def allow(self, pos, priority, live):
+        if live >= self.cap * self.SHARES[priority]:
+            self.denied += 1
+            return False
+        band = self.band(pos)
+        factor = self.LOD[priority][band]
+        if factor < 1:
+            # Afinamento sem sortear: acumula a fração e libera uma partícula a cada unidade
+            key = (priority, band)
+            credit = self.credit.get(key, 0.0) + factor
+            if credit < 1:
+                self.credit[key] = credit
+                self.denied += 1
+                return False
+            self.credit[key] = credit - 1
+        self.granted += 1
+        return True
+
+    def adapt(self, frame_ms):
+        # Corta rápido quando o quadro estoura o alvo, devolve devagar quando sobra tempo
+        self.frame_ms += (frame_ms - self.frame_ms) * 0.1
+        if self.frame_ms > self.target_ms:
+            self.cap = max(self.min_cap, self.cap * 0.95)
+        elif self.frame_ms < self.target_ms * 0.75:
+            self.cap = min(self.max_cap, self.cap + 10)
+
+
+class ParticleSystem:
+    """All short-lived particles of a level, stored as NumPy arrays (struct of arrays).
+
+    update() advances every live particle with a handful of vectorised operations and
+    draw() blits pre-rendered stamps, cached by (shape, size, colour, alpha), in one
+    Surface.blits call. Particles are plain array rows, not sprites: emit them with
+    the emit_* methods (or the module functions, which use the level's system and
+    ask its budget first).
+    """
+
+    def __init__(self, capacity=1024, budget=None):
+        self.count = 0
+        self.budget = budget
+        self.palette = {}  # cor base -> índice
+        self.colors = []
+        self.stamps = {}
+        self.water_colors = np.array([self.color_index(color) for color in WATER_SHADES], np.int32)
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        old = getattr(self, 'pos', None)
+        n = self.count
+        fields = {
+            'pos': (2, np.float32), 'vel': (2, np.float32), 'acc': (2, np.float32), 'drift': (2, np.float32),
+            'size0': (None, np.float32), 'age': (None, np.float32), 'life': (None, np.float32),
+            'radius': (None, np.float32), 'max_radius': (None, np.float32), 'grow': (None, np.float32),
+            'alpha': (None, np.float32), 'fade': (None, np.float32),
+            'kind': (None, np.int8), 'color': (None, np.int32), 'stopped': (None, np.bool_),
+        }
+        for name, (width, dtype) in fields.items():
+            shape = (capacity, width) if width else (capacity,)
+            array = np.zeros(shape, dtype)
+            if old is not None:
+                array[:n] = getattr(self, name)[:n]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def allow(self, pos, priority=EFFECT):
+        return self.budget is None or self.budget.allow(pos, priority, self.count)
+
+    def color_index(self, color):
+        color = tuple(int(c) for c in color[:3])
+        index = self.palette.get(color)
+        if index is None:
+            index = self.palette[color] = len(self.colors)
+            self.colors.append(color)
+        return index
+
+    def emit(self, kind, pos, color, size=0, lifespan=1000, velocity=(0, 0), acceleration=(0, 0), drift=(0, 0)):
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        i = self.count
+        self.count += 1
+        self.kind[i] = kind
+        self.pos[i] = pos
+        self.vel[i] = velocity
+        self.acc[i] = acceleration
+        self.drift[i] = drift
+        self.size0[i] = size
+        self.age[i] = 0
+        self.life[i] = lifespan / 1000
+        self.color[i] = self.color_index(color)
+        self.stopped[i] = False
+        return i
+
+    def emit_particle(self, pos, color=(255, 255, 255), initial_size=10, lifespan=1000, wind_direction=(0, 0), wind_speed=0):
+        # Velocidade inicial aleatória para a explosão, gravidade por tick
+        velocity = (random.uniform(-1, -3), random.uniform(-1, -3))
+        drift = (wind_direction[0] * wind_speed, wind_direction[1] * wind_speed)
+        self.emit(PARTICLE, pos, color, initial_size, lifespan, velocity, (0.05, 0.05), drift)
+
+    def emit_trail(self, pos, color, initial_size=6, lifespan=700):
+        self.emit(TRAIL, pos, color, initial_size, lifespan)
+
+    def emit_smoke(self, pos, color, initial_size=7, lifespan=5000):
+        velocity = (random.uniform(-3, -4), random.uniform(-3, -4))
+        self.emit(SMOKE, pos, color, initial_size, lifespan, velocity)
+
+    def emit_ember(self, pos, color, initial_size=3, lifespan=1000):
+        self.emit(EMBER, pos, color, initial_size, lifespan, (-1, -1))
+
+    def emit_water(self, pos, initial_size=3, lifespan=1000):
+        # Tom inicial sorteado; appearance() avança pelos tons ao longo da vida
+        pos = (pos[0] + random.uniform(-1, 5), pos[1] + random.uniform(-15, 15))
+        i = self.emit(WATER, pos, WATER_SHADES[0], initial_size, lifespan, (0, 1))
+        self.color[i] = random.randint(0, len(WATER_SHADES) - 1)
+
+    def emit_blood(self, pos, velocity=None):
+        if velocity is None:
+            velocity = (random.uniform(-1, 1), random.uniform(-2, 0))
+        i = self.emit(BLOOD, pos, (200, 0, 0), 0, 0, velocity, (0.5, 0.5))
+        self.radius[i] = 3
+        self.max_radius[i] = random.uniform(3, 5)
+        self.grow[i] = random.uniform(0.5, 1)
+        self.alpha[i] = 255
+        self.fade[i] = random.uniform(0.5, 1)
+        self.life[i] = random.uniform(0.2, 0.5)  # tempo até parar no chão
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        kind = self.kind[:n]
+        pos, vel, age, life = self.pos[:n], self.vel[:n], self.age[:n], self.life[:n]
+        age += dt
+
+        timed = kind != BLOOD
+        alive = ~timed | (age < life)
+
+        moving = kind == PARTICLE
+        vel[moving] += self.acc[:n][moving]
+        pos[moving] += self.drift[:n][moving] * dt + vel[moving]
+
+        smoke = kind == SMOKE
+        pos[smoke] += vel[smoke] * (1 + age[smoke] / life[smoke])[:, None] * 0.3
+
+        ember = (kind == EMBER) | (kind == WATER)
+        pos[ember] += vel[ember]
+
+        blood = kind == BLOOD
+        if blood.any():
+            stopped = self.stopped[:n]
+            flying = blood & ~stopped
+            vel[flying] += self.acc[:n][flying] * dt
+            pos[flying] += vel[flying] * dt
+            landed = blood & stopped
+            radius, max_radius, alpha = self.radius[:n], self.max_radius[:n], self.alpha[:n]
+            growing = landed & (radius < max_radius)
+            radius[growing] += self.grow[:n][growing] * dt
+            fading = landed & (radius >= max_radius)
+            alpha[fading] -= self.fade[:n][fading]
+            alive &= ~(fading & (alpha <= 0))
+            stopped |= flying & (age >= life)
+
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            for name in ('pos', 'vel', 'acc', 'drift', 'size0', 'age', 'life', 'radius', 'max_radius',
+                         'grow', 'alpha', 'fade', 'kind', 'color', 'stopped'):
+                array = getattr(self, name)
+                array[:len(keep)] = array[keep]
+            self.count = len(keep)
+
+    def appearance(self):
+        """Per-particle (size, radius, fade level, alpha level, colour) for the current state."""
+        n = self.count
+        kind = self.kind[:n]
+        t = np.clip(self.age[:n] / np.maximum(self.life[:n], 1e-6), 0, 1)
+        size0 = self.size0[:n]
+        fade = 1 - t  # Particle/Trail/Smoke escurecem ou somem com o tempo
+
+        size = np.maximum(1, (size0 * fade).astype(np.int32))
+        radius = size // 2
+        color_level = np.where(kind == TRAIL, 1.0, fade)
+        alpha = np.where(kind == TRAIL, 255 * fade, 255.0)
+
+        smoke = kind == SMOKE
+        size[smoke] = (size0[smoke] * (1 + t[smoke])).astype(np.int32)
+        radius[smoke] = size[smoke] // 2
+        alpha[smoke] = 200 * fade[smoke]
+
+        ember = kind == EMBER
+        size[ember] = size0[ember].astype(np.int32)
+        radius[ember] = -1  # quadrado cheio
+        color_level[ember] = 1.0
+        alpha[ember] = 200 * fade[ember]
+
+        color = self.color[:n]
+        water = kind == WATER
+        if water.any():
+            size[water] = size0[water].astype(np.int32)
+            radius[water] = -1
+            color_level[water] = 1.0
+            alpha[water] = 200
+            shades = len(WATER_SHADES)
+            color = color.copy()
+            color[water] = self.water_colors[(color[water] + (t[water] * shades).astype(np.int32)) % shades]
+
+        blood = kind == BLOOD
+        if blood.any():
+            blood_radius = self.radius[:n][blood]
+            size[blood] = np.ceil(blood_radius * 2).astype(np.int32)
+            radius[blood] = blood_radius.astype(np.int32)
+            color_level[blood] = 1.0
+            alpha[blood] = np.clip(self.alpha[:n][blood], 0, 255)
+
+        levels = FADE_LEVELS - 1
+        return (size, radius,
+                np.rint(color_level * levels).astype(np.int32),
+                np.rint(alpha / 255 * levels).astype(np.int32), color)
+
+    def stamp(self, code):
+        # code = size | (radius + 1) << 8 | color_level << 16 | alpha_level << 21 | color << 26
+        surface = self.stamps.get(code)
+        if surface is None:
+            size, radius = code & 0xFF, ((code >> 8) & 0xFF) - 1
+            color_level, alpha_level, color = (code >> 16) & 0x1F, (code >> 21) & 0x1F, code >> 26
+            levels = FADE_LEVELS - 1
+            r, g, b = (c * color_level / levels for c in self.colors[color])
+            rgba = (r, g, b, 255 * alpha_level / levels)
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            if radius < 0:
+                surface.fill(rgba)
+            else:
+                pygame.draw.circle(surface, rgba, (size // 2, size // 2), radius)
+            self.stamps[code] = surface
+        return surface
+
+    def draw(self, screen, offset=(0, 0), view=None):
+        # offset: deslocamento da câmera (camera.camera.topleft); view: área visível em coordenadas do mundo
+        n = self.count
+        if not n:
+            return
+        size, radius, color_level, alpha_level, color = self.appearance()
+        x = self.pos[:n, 0]
+        y = self.pos[:n, 1]
+        # Mesma visibilidade dos sprites: raio 0 não desenha nada, alpha 0 é invisível
+        visible = (radius != 0) & (alpha_level > 0) & (size > 0) & (size < 256)
+        if view is not None:
+            visible &= (x + size > view.left) & (x - size < view.right) & (y + size > view.top) & (y - size < view.bottom)
+        index = np.flatnonzero(visible)
+        if not len(index):
+            return
+        size = size[index]
+        codes = (size.astype(np.int64) | (radius[index].astype(np.int64) + 1) << 8
+                 | color_level[index].astype(np.int64) << 16 | alpha_level[index].astype(np.int64) << 21
+                 | color[index].astype(np.int64) << 26)
+        stamps = self.stamps
+        for code in np.unique(codes).tolist():
+            if code not in stamps:
+                self.stamp(code)
+        half = size // 2
+        left = (np.floor(x[index]).astype(np.int32) - half + offset[0]).tolist()
+        top = (np.floor(y[index]).astype(np.int32) - half + offset[1]).tolist()
+        surfaces = map(stamps.__getitem__, codes.tolist())
+        screen.blits(list(zip(surfaces, zip(left, top))), doreturn=False)
+
+
+_system = None
+
+
+def set_system(system):
+    """Sistema que recebe as partículas emitidas pelos efeitos (o Level atual)."""
+    global _system
+    _system = system
+
+
+def get_system():
+    return _system
+
+
+def emit_particle(pos, color=(255, 255, 255), initial_size=10, lifespan=1000, wind_direction=(0, 0), wind_speed=0,
+                  priority=EFFECT):
+    if _system is not None and _system.allow(pos, priority):
+        _system.emit_particle(pos, color, initial_size, lifespan, wind_direction, wind_speed)
+
+
+def emit_trail(pos, color, initial_size=6, lifespan=700, priority=EFFECT):
+    if _system is not None and _system.allow(pos, priority):
+        _system.emit_trail(pos, color, initial_size, lifespan)
+
+
+def emit_smoke(pos, color, initial_size=7, lifespan=5000, priority=AMBIENT):
+    if _system is not None and _system.allow(pos, priority):
+        _system.emit_smoke(pos, color, initial_size, lifespan)
+
+
+def emit_ember(pos, color, initial_size=3, lifespan=1000, priority=AMBIENT):
+    if _system is not None and _system.allow(pos, priority):
+        _system.emit_ember(pos, color, initial_size, lifespan)
+
+
+def emit_water(pos, initial_size=3, lifespan=1000, priority=AMBIENT):
+    if _system is not None and _system.allow(pos, priority):
+        _system.emit_water(pos, initial_size, lifespan)
+
+
+def emit_blood(pos, velocity=None, priority=COMBAT):
+    if _system is not None and _system.allow(pos, priority):
+        _system.emit_blood(pos, velocity)
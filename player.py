@@ -6,47 +6,27 @@ from effects import *
 import random
 from enemy import Enemy
 from ItemDrop import ItemDrop
-from key_pressed_notifier import KeyPressedNotifier
+from event_bus import events, KEYDOWN
 from text_display import FloatingText
 import time
+from assets import load_spritesheet, load_spritesheet_masks
+from particles import emit_particle, emit_trail
+from lighting import add_light
 
-def load_spritesheet(image_path, sprite_width, sprite_height, rows, columns):
-    sheet = pygame.image.load(image_path).convert_alpha()
-    sheet_width, sheet_height = sheet.get_size()
-    sprites = []
-
-    for row in range(rows):
-        row_sprites = []
-        for col in range(columns):
-            rect = pygame.Rect(col * sprite_width, row * sprite_height, sprite_width, sprite_height)
-            if rect.right <= sheet_width and rect.bottom <= sheet_height:
-                sprite = sheet.subsurface(rect).copy()
-                row_sprites.append(sprite)
-        sprites.append(row_sprites)
-
-    return sprites
-
-def is_sprite_empty(sprite):
-
-    for x in range(sprite.get_width()):
-        for y in range(sprite.get_height()):
-            if sprite.get_at((x, y)).a != 0:
-                return False
-    return True
-
-    
 class Player(pygame.sprite.Sprite):
     def __init__(self, pos, groups, collidable_tiles, projectile_group, level,state=None):
         super().__init__(groups)
+        add_light(self, 50, (100, 50, 22))
         self.gold = 0
 
         self.level = level
         self.sprites = load_spritesheet('images/kakashi.png', 64, 64, 36, 4)
+        self.masks = load_spritesheet_masks('images/kakashi.png', 64, 64, 36, 4)
 
         self.current_sprite = 0
         self.image = self.sprites[0][self.current_sprite]
         self.rect = self.image.get_rect(topleft=pos)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.masks[0][self.current_sprite]
         self.current_time = 0
         self.action = 'idle_down'
         self.last_direction = 'down'
@@ -153,7 +133,9 @@ class Player(pygame.sprite.Sprite):
         self.last_shuriken_message_time = 0
         self.shuriken_message_cooldown = 5  # 5 seconds cooldown
 
-        KeyPressedNotifier.subscribe(self.on_keydown_event)
+        # Só as teclas tratadas em on_keydown_event; o Level é o escopo (fechado quando o nível é trocado)
+        for key in (pygame.K_j, pygame.K_k, pygame.K_SPACE):
+            events.subscribe(KEYDOWN, self.on_keydown_event, key, scope=self.level)
         self.reset_raikiri_state()
         self.raikiri_max_duration = 5000  # Maximum duration for Raikiri state (5 seconds)
         self.raikiri_animation_duration = 1000  # Duration of the initial Raikiri animation in milliseconds
@@ -309,18 +291,10 @@ class Player(pygame.sprite.Sprite):
         
         WaterLoad(river_pos, direction, target_pos, [self.level.all_sprites, self.water_particles], speed=200, lifespan=2000)
         
-        ParticleTrail(river_pos,[self.level.all_sprites],color=(100, 100, 255),initial_size=3,lifespan=2000)
+        emit_trail(river_pos, color=(100, 100, 255), initial_size=3, lifespan=2000)
        
     def find_nearest_river_tile(self):
-        nearest_tile = None
-        nearest_distance = float('inf')
-        for tile in self.level.tiles:
-            if hasattr(tile, 'image_path') and tile.image_path == 'images/map/river1.png':
-                distance = pygame.math.Vector2(self.rect.center).distance_to(tile.rect.center)
-                if distance < nearest_distance:
-                    nearest_distance = distance
-                    nearest_tile = tile.rect.center
-        return nearest_tile
+        return self.level.proximity.nearest_tile(self.rect.center, 'images/map/river1.png')
 
     def release_water_magic(self):
         if self.water_mass > 0:
@@ -352,12 +326,8 @@ class Player(pygame.sprite.Sprite):
             self.gold = state.get('gold', self.gold)
             self.gold = state.get('gold', 0)  # Use 0 as default if 'gold' is not in the state
         
-    def play_sound(effect_type):
-        sound_path = sound_data.get(effect_type)
-        if isinstance(sound_path, list):
-            sound_path = random.choice(sound_path)
-        sound = pygame.mixer.Sound(sound_path)
-        sound.play()
+    def play_sound(self, effect_type):
+        play_sound(effect_type)
         
     def on_keydown_event(self, key):
         now = pygame.time.get_ticks()
@@ -409,7 +379,7 @@ class Player(pygame.sprite.Sprite):
             return
         
         move_x = move_y = 0
-        keys = pygame.key.get_pressed()
+        keys = self.level.controls.get_pressed()
 
         if keys[pygame.K_a]:
             self.action = 'run_left' if keys[pygame.K_LSHIFT] else 'walk_left'
@@ -486,14 +456,7 @@ class Player(pygame.sprite.Sprite):
                     enemy.take_damage(damage, self.level.all_sprites, self.level.tiles, (255, 0, 0), knockback_direction)
 
     def find_closest_enemy(self, max_distance):
-        closest_enemy = None
-        closest_distance = float('inf')
-        for enemy in self.level.enemies:
-            distance = pygame.math.Vector2(self.rect.center).distance_to(enemy.rect.center)
-            if distance < closest_distance and distance <= max_distance:
-                closest_distance = distance
-                closest_enemy = enemy
-        return closest_enemy
+        return self.level.proximity.nearest(self.rect.center, 'enemies', max_distance, inclusive=True)
 
             
     def attack_with_shuriken(self):
@@ -517,7 +480,7 @@ class Player(pygame.sprite.Sprite):
             return
         direction.normalize_ip()
         
-        new_projectile = Projectile(
+        new_projectile = Projectile.spawn(
             pos=self.rect.center,
             direction=direction,
             throw_speed=self.throw_speed,
@@ -535,7 +498,7 @@ class Player(pygame.sprite.Sprite):
             direction = pygame.math.Vector2(closest_enemy.rect.center) - pygame.math.Vector2(self.rect.center)
             if direction.length() > 0:
                 direction.normalize_ip()
-                fireball = Projectile(pos=self.rect.center,direction=direction,throw_speed=self.throw_speed, groups=[self.level.all_sprites, self.projectile_group],projectile_type='fireball',level=self.level,side='player_projectile',
+                fireball = Projectile.spawn(pos=self.rect.center,direction=direction,throw_speed=self.throw_speed, groups=[self.level.all_sprites, self.projectile_group],projectile_type='fireball',level=self.level,side='player_projectile',
 
                 )
                 self.mana -= 10
@@ -581,8 +544,8 @@ class Player(pygame.sprite.Sprite):
                     raikiridmg = 150 * self.ninjutsu
                     self.raikiri_target.take_damage(raikiridmg, self.level.all_sprites, self.level.tiles, (0, 150, 240), direction)
                     for _ in range(20):
-                        Particle(self.raikiri_target.rect.bottomright, [self.level.all_sprites], (230,230,250), initial_size=8, lifespan=2000)
-                        Particle(self.raikiri_target.rect.bottomright, [self.level.all_sprites], (230,10,0), initial_size=4, lifespan=2000)
+                        emit_particle(self.raikiri_target.rect.bottomright, (230,230,250), initial_size=8, lifespan=2000)
+                        emit_particle(self.raikiri_target.rect.bottomright, (230,10,0), initial_size=4, lifespan=2000)
                     self.reset_raikiri_state()
             else:
                 self.reset_raikiri_state()
@@ -624,17 +587,17 @@ class Player(pygame.sprite.Sprite):
             Kawarimi(self.rect.center, [self.level.all_sprites], self.level.all_sprites, self.level.top_sprites)
             self.rect.x += direction[0] * 4 * 32  # 4 tiles de distância
             self.rect.y += direction[1] * 4 * 32
-            Puff(self.rect.center, [self.level.all_sprites])
+            Puff.spawn(self.rect.center, [self.level.all_sprites])
             self.hp += amount  # Recupera o dano sofrido
 
     def take_damage(self, amount, knockback_direction, color):
         if self.is_performing_special_attack:
-            FloatingText('MISS', self.rect, 'white', self.level.camera, self.level.all_sprites)      
+            FloatingText.spawn('MISS', self.rect, 'white', self.level.camera, self.level.all_sprites)      
         if not self.invincible:
             self.kawarimi(amount)  # Tenta ativar a habilidade Kawarimi
             self.hp -= amount
             self.level.spawn_blood(self.rect.center, amount=int(amount * 2))
-            #FloatingText(str(amount), self.rect, color, self.level.camera, self.level.all_sprites)
+            #FloatingText.spawn(str(amount), self.rect, color, self.level.camera, self.level.all_sprites)
             if self.hp <= 0:
                 self.kill()
             else:
@@ -671,7 +634,7 @@ class Player(pygame.sprite.Sprite):
             # Exemplo: self.inventory.append(item.item)
 
     def update(self, dt):
-        keys = pygame.key.get_pressed()
+        keys = self.level.controls.get_pressed()
         now = pygame.time.get_ticks()
 
         if self.is_attacking:
@@ -752,6 +715,7 @@ class Player(pygame.sprite.Sprite):
                 self.current_time = 0
                 self.current_sprite = (self.current_sprite + 1) % len(self.sprites[action_index])
                 self.image = self.sprites[action_index][self.current_sprite]
+                self.mask = self.masks[action_index][self.current_sprite]
 
     def get_action_index(self, action):
         return self.action_map.get(action, 0)
@@ -0,0 +1,102 @@
+_pools = []
+
+
+class Pool:
+    """Free list for one sprite class.
+
+    acquire() reuses a released instance through its reset() (same arguments as the
+    constructor) or builds a new one when the free list is empty. kill() hands the
+    instance back via release(), but it only becomes reusable at flush(), at the end
+    of the tick, because collision loops and effects may still hold it until then.
+    At most `capacity` instances are kept; the rest are left to the GC.
+    """
+
+    def __init__(self, cls, capacity=128):
+        self.cls = cls
+        self.capacity = capacity
+        self.free = []
+        self.pending = []
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0
+        _pools.append(self)
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            sprite = self.free.pop()
+            self.hits += 1
+            sprite.pool_state = 'live'
+            sprite.generation += 1  # outra vida: SpatialGrid volta a carimbar a ordem
+            sprite.reset(*args, **kwargs)
+        else:
+            self.misses += 1
+            sprite = self.cls(*args, **kwargs)
+            sprite.pool_state = 'live'
+        return sprite
+
+    def release(self, sprite):
+        # Idempotente: kill() pode ser chamado várias vezes no mesmo tick
+        if sprite.pool_state != 'live':
+            return
+        sprite.pool_state = 'pending'
+        self.pending.append(sprite)
+
+    def flush(self):
+        for sprite in self.pending:
+            if sprite.alive():
+                sprite.pool_state = 'live'  # voltou para um grupo depois do kill()
+            elif len(self.free) < self.capacity:
+                sprite.pool_state = 'free'
+                self.free.append(sprite)
+            else:
+                sprite.pool_state = None
+                self.dropped += 1
+        self.pending.clear()
+
+    def clear(self):
+        for sprite in self.free + self.pending:
+            sprite.pool_state = None
+        self.free.clear()
+        self.pending.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'free': len(self.free), 'dropped': self.dropped}
+
+
+class Pooled:
+    """Mixin for pooled sprites: create them with Cls.spawn(...) instead of Cls(...).
+
+    The class needs a `pool = Pool(Cls)` attribute (assigned after the class body) and
+    a reset() that takes the constructor's arguments and reinitialises the instance.
+    Instances built directly with Cls(...) work as before and are never recycled.
+    `generation` counts the reuses, so caches keyed by the instance can tell a
+    recycled sprite from the one they saw before.
+    """
+
+    pool = None
+    pool_state = None
+    generation = 0
+
+    @classmethod
+    def spawn(cls, *args, **kwargs):
+        return cls.pool.acquire(*args, **kwargs)
+
+    def kill(self):
+        super().kill()
+        if self.pool_state == 'live':
+            type(self).pool.release(self)
+
+
+def flush_pools():
+    for pool in _pools:
+        pool.flush()
+
+
+def clear_pools():
+    # Um nível novo não deve reaproveitar sprites que ainda apontam para o anterior
+    for pool in _pools:
+        pool.clear()
+
+
+def pool_stats():
+    return {pool.cls.__name__: pool.stats() for pool in _pools}
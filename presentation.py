@@ -0,0 +1,40 @@
+import pygame
+from settings import *
+
+
+def scale_surface(surface, size, smooth=SMOOTH_SCALING, dest=None):
+    """transform.scale or smoothscale (when `smooth`), writing into `dest` if given."""
+    if smooth and surface.get_bitsize() in (24, 32):
+        scale = pygame.transform.smoothscale
+    else:
+        scale = pygame.transform.scale  # vizinho mais próximo
+    if dest is None:
+        return scale(surface, size)
+    return scale(surface, size, dest)
+
+
+class Presenter:
+    """Puts the game's internal surface on the window, zoomed, without allocating.
+
+    The zoomed image is scaled straight into a subsurface of the window when it
+    fits (the usual case), otherwise into a persistent buffer that is then blitted
+    centred. With smooth=False scaling is nearest-neighbour, which keeps the pixel
+    art sharp and is the cheaper of the two.
+    """
+
+    def __init__(self, window, source_size, zoom, smooth=SMOOTH_SCALING):
+        self.window = window
+        self.smooth = smooth
+        self.size = (source_size[0] * zoom, source_size[1] * zoom)
+        self.position = ((window.get_width() - self.size[0]) // 2, (window.get_height() - self.size[1]) // 2)
+        rect = pygame.Rect(self.position, self.size)
+        if window.get_rect().contains(rect):
+            self.target = window.subsurface(rect)
+            self.buffer = None
+        else:
+            self.buffer = self.target = pygame.Surface(self.size).convert(window)
+
+    def present(self, surface):
+        scale_surface(surface, self.size, self.smooth, self.target)
+        if self.buffer is not None:
+            self.window.blit(self.buffer, self.position)
@@ -2,10 +2,27 @@ import pygame
 from settings import *
 import math
 from effects import *
-class Projectile(pygame.sprite.Sprite):
+from assets import load_rotation_atlas, rotation_index
+from particles import emit_particle, emit_trail
+from pooling import Pool, Pooled
+from lighting import add_light, remove_light
+
+
+def preload_projectile_atlases():
+    # Pré-calcula as rotações de todas as imagens de projétil uma única vez
+    for data in weapon_data.values():
+        if data.get('type', 'ranged') == 'ranged':
+            load_rotation_atlas(data['graphic'], ROTATION_STEPS)
+
+
+class Projectile(Pooled, pygame.sprite.Sprite):
     def __init__(self, pos, direction, groups, projectile_type, level, throw_speed=1, side=None, from_collision=False):
-        super().__init__(groups)
-        self.image = pygame.image.load(weapon_data[projectile_type]['graphic']).convert_alpha()
+        super().__init__()
+        self.reset(pos, direction, groups, projectile_type, level, throw_speed, side, from_collision)
+
+    def reset(self, pos, direction, groups, projectile_type, level, throw_speed=1, side=None, from_collision=False):
+        self.atlas = load_rotation_atlas(weapon_data[projectile_type]['graphic'], ROTATION_STEPS)
+        self.image, self.mask = self.atlas[0]
         self.rect = self.image.get_rect(center=pos)
         self.direction = direction
         self.speed = weapon_data[projectile_type]['speed'] * throw_speed
@@ -13,7 +30,6 @@ class Projectile(pygame.sprite.Sprite):
         self.level = level
         self.side = side
         self.from_collision = from_collision  # Novo sinalizador para verificar se foi criado a partir de uma colisão
-        self.mask = pygame.mask.from_surface(self.image)
 
         self.original_image = self.image  # Guardar a imagem original
         self.type = projectile_type
@@ -25,11 +41,19 @@ class Projectile(pygame.sprite.Sprite):
         self.rotation_angle = 0
         if not self.rotating:
             self.set_fixed_angle()
+        if projectile_type == 'fireball':
+            add_light(self, 70, (255, 150, 50))
+        else:
+            remove_light(self)  # instância reaproveitada de uma bola de fogo
+        self.add(*groups)
         print("Created projectile " + side)
 
     def set_fixed_angle(self):
         angle = math.degrees(math.atan2(-self.direction.y, self.direction.x))  # Calcular o ângulo em graus
-        self.image = pygame.transform.rotate(self.original_image, angle)
+        self.set_angle(angle)
+
+    def set_angle(self, angle):
+        self.image, self.mask = self.atlas[rotation_index(angle, ROTATION_STEPS)]
         self.rect = self.image.get_rect(center=self.rect.center)
 
     def check_bounds(self):
@@ -45,22 +69,19 @@ class Projectile(pygame.sprite.Sprite):
             self.fireball_collision_with_enemies()
 
         if self.rotating:
-            self.rotation_angle += 14  # Ajuste a velocidade de rotação conforme necessário
-            self.image = pygame.transform.rotate(pygame.image.load(weapon_data[self.type]['graphic']).convert_alpha(), self.rotation_angle)
-            self.rect = self.image.get_rect(center=self.rect.center)
-        else:
-            self.set_fixed_angle()
+            self.rotation_angle = (self.rotation_angle + 14) % 360  # Ajuste a velocidade de rotação conforme necessário
+            self.set_angle(self.rotation_angle)
         self.check_bounds()
         # Criar partículas de rastro
         if self.type == 'fireball':
-            ParticleTrail(self.rect.center, [self.level.all_sprites], color=(250, 150, 0), initial_size=25, lifespan=400)
+            emit_trail(self.rect.center, color=(250, 150, 0), initial_size=25, lifespan=400)
         elif self.type =='poison_kunai':
-            ParticleTrail(self.rect.center, [self.level.all_sprites], color=(200, 0, 200), initial_size=8, lifespan=800)
+            emit_trail(self.rect.center, color=(200, 0, 200), initial_size=8, lifespan=800)
         elif self.type =='fuuma':
-            ParticleTrail(self.rect.center, [self.level.all_sprites], color=(100, 100, 100), initial_size=10, lifespan=600)
+            emit_trail(self.rect.center, color=(100, 100, 100), initial_size=10, lifespan=600)
 
         else:
-            ParticleTrail(self.rect.center, [self.level.all_sprites], color=(100, 100, 100), initial_size=5, lifespan=500)
+            emit_trail(self.rect.center, color=(100, 100, 100), initial_size=5, lifespan=500)
 
     def fireball_collision_with_enemies(self): 
         # Verifica colisão com troncos
@@ -99,7 +120,7 @@ class Projectile(pygame.sprite.Sprite):
                 if self.type == 'fireball':
                     self.create_explosion()
                 else:
-                    Spark(self.rect.center, [self.level.all_sprites, self.level.overlay_sprites])
+                    Spark.spawn(self.rect.center, [self.level.all_sprites, self.level.overlay_sprites])
                     self.level.play_random_spark_sound()
                 self.kill()
                 return
@@ -117,7 +138,7 @@ class Projectile(pygame.sprite.Sprite):
 
 
     def create_explosion(self):
-        explosion = self.explosion_effect(self.rect.center, [self.level.all_sprites])
+        explosion = self.explosion_effect.spawn(self.rect.center, [self.level.all_sprites])
         for enemy in self.level.enemies:
             if self.side == 'player_projectile':
                 distance = pygame.math.Vector2(self.rect.center).distance_to(enemy.rect.center)
@@ -137,14 +158,15 @@ class Projectile(pygame.sprite.Sprite):
                 FireWork(self.rect.center,groups=[self.level.all_sprites])
     def create_particles(self):
         for _ in range(11):  # Cria 10 partículas
-            Particle(
+            emit_particle(
                 pos=self.rect.center,
-                groups=[self.level.all_sprites],
                 color=(255, 160, 0),  # Vermelho
                 initial_size=30,
                 lifespan=1400
             )
 
+Projectile.pool = Pool(Projectile, capacity=256)
+
 # Adicione essa função ao seu arquivo de nível (level.py)
 def check_collisions(self):
     # Verificar colisão do player com inimigos
@@ -0,0 +1,143 @@
+import math
+
+
+class ProximityService:
+    """Nearest-target queries for the level, answered from a grid rebuilt once per tick.
+
+    Factions:
+        'enemies' -> level.enemies
+        'friends' -> the player followed by level.ally (the enemies' targets)
+
+    Positions are snapshotted the first time a faction is queried in a tick, and every
+    answer is cached until begin_tick(), so repeated queries in the same tick are free.
+    Tile queries index the static tiles of one image once per level.
+    """
+
+    LINEAR_LIMIT = 8
+
+    def __init__(self, level, cell_size=256):
+        self.level = level
+        self.cell_size = cell_size
+        self.tick = 0
+        self.factions = {}  # faction -> (entries, cells, bounds), valid for the current tick
+        self.tile_grids = {}  # image_path -> (entries, cells, bounds), valid for the whole level
+        self.results = {}
+
+    def begin_tick(self):
+        self.tick += 1
+        self.factions.clear()
+        self.results.clear()
+
+    def members(self, faction):
+        if faction == 'enemies':
+            return list(self.level.enemies)
+        if faction == 'friends':
+            return [self.level.player] + list(self.level.ally)
+        raise ValueError(f"Unknown faction: {faction}")
+
+    def is_member(self, sprite, faction):
+        if faction == 'enemies':
+            return sprite in self.level.enemies
+        return sprite is self.level.player or sprite in self.level.ally
+
+    def nearest(self, pos, faction, radius, exclude=None, inclusive=False):
+        """Nearest sprite of `faction` whose centre is closer than `radius` to `pos`.
+
+        With inclusive=True a sprite exactly at `radius` also counts.
+        """
+        pos = (pos[0], pos[1])
+        key = (faction, pos, radius, exclude, inclusive)
+        if key in self.results:
+            return self.results[key]
+        index = self.factions.get(faction)
+        if index is None:
+            index = self.factions[faction] = self.build_index(
+                (sprite, sprite.rect.center) for sprite in self.members(faction))
+        if faction == 'enemies':
+            group = self.level.enemies
+            accept = lambda sprite: sprite is not exclude and sprite in group
+        else:
+            accept = lambda sprite: sprite is not exclude and self.is_member(sprite, faction)
+        found = self.search(index, pos, radius, inclusive, accept)
+        self.results[key] = found
+        return found
+
+    def nearest_tile(self, pos, image_path, radius=float('inf')):
+        """Centre of the nearest tile drawn with `image_path`, or None."""
+        pos = (pos[0], pos[1])
+        key = ('tile', pos, image_path, radius)
+        if key in self.results:
+            return self.results[key]
+        index = self.tile_grids.get(image_path)
+        if index is None:
+            tiles = [tile for tile in self.level.tiles if getattr(tile, 'image_path', None) == image_path]
+            index = self.tile_grids[image_path] = self.build_index((tile, tile.rect.center) for tile in tiles)
+        tile = self.search(index, pos, radius, False, None)
+        found = tile.rect.center if tile is not None else None
+        self.results[key] = found
+        return found
+
+    def build_index(self, entries):
+        size = self.cell_size
+        entries = [(order, item, x, y) for order, (item, (x, y)) in enumerate(entries)]
+        if len(entries) <= self.LINEAR_LIMIT:
+            # Poucos candidatos (ex.: jogador + aliado): a varredura direta é mais barata que a grade
+            return entries, None, None
+        cells = {}
+        for entry in entries:
+            cells.setdefault((entry[2] // size, entry[3] // size), []).append(entry)
+        xs = [cell[0] for cell in cells]
+        ys = [cell[1] for cell in cells]
+        return entries, cells, (min(xs), min(ys), max(xs), max(ys))
+
+    def search(self, index, pos, radius, inclusive, accept):
+        entries, cells, bounds = index
+        if cells is None:
+            return self.closest(entries, pos, radius, inclusive, accept)[0]
+        size = self.cell_size
+        px, py = pos
+        cx, cy = int(px // size), int(py // size)
+        min_x, min_y, max_x, max_y = bounds
+        max_ring = max(cx - min_x, max_x - cx, cy - min_y, max_y - cy)
+
+        best = (None, None, radius)
+        for ring in range(max_ring + 1):
+            # Cells in this ring are at least (ring - 1) * size away
+            if ring > 1 and (ring - 1) * size > best[2]:
+                break
+            for cell in self.ring_cells(cx, cy, ring):
+                bucket = cells.get(cell)
+                if bucket:
+                    best = self.closest(bucket, pos, radius, inclusive, accept, best)
+        return best[0]
+
+    @staticmethod
+    def closest(entries, pos, radius, inclusive, accept, best=None):
+        best_item, best_order, best_distance = best if best is not None else (None, None, radius)
+        px, py = pos
+        for order, item, x, y in entries:
+            distance = math.hypot(x - px, y - py)
+            if distance > best_distance:
+                continue
+            if distance == best_distance:
+                # Empate: fica o primeiro da lista, como nas varreduras lineares
+                if best_item is None and not inclusive:
+                    continue
+                if best_item is not None and order > best_order:
+                    continue
+            if accept is not None and not accept(item):
+                continue
+            best_item, best_order, best_distance = item, order, distance
+        return best_item, best_order, best_distance
+
+    @staticmethod
+    def ring_cells(cx, cy, ring):
+        if ring == 0:
+            yield cx, cy
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield x, cy - ring
+            yield x, cy + ring
+        for y in range(cy - ring + 1, cy + ring):
+            yield cx - ring, y
+            yield cx + ring, y
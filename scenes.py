@@ -0,0 +1,374 @@
+import pygame
+from enum import Enum
+from settings import *
+from button import Button
+from event_bus import events, KEYDOWN
+
+
+class GameState(Enum):
+    MENU = 1
+    VILLAGE = 2
+    PLAYING = 3
+    MISSION_COMPLETE = 4
+    GAME_OVER = 5
+    PAUSED = 6
+    OFFICE = 7
+    SHOP = 8
+    BARRACKS = 9
+    LOADING = 10
+
+
+class Scene:
+    """One screen of the game, driven by Game.run.
+
+    The scene at the top of the game's stack is the active one: enter() is called
+    when it becomes active (pushed, switched to, or uncovered by a pop) and exit()
+    when it stops being active. Each frame it gets handle_event() for every event,
+    then update(dt) and render(surface). Static scenes (animated = False) are only
+    rendered again after an input event. Scenes are built once by Game and kept, so
+    their buttons and backgrounds survive between visits.
+    """
+
+    state = None
+    animated = False
+    fps = MENU_FPS
+
+    def __init__(self, game):
+        self.game = game
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def render(self, surface):
+        pass
+
+    def frame_done(self, frame_ms):
+        # Tempo de trabalho do quadro (eventos + update + render + apresentação), medido pelo Game
+        pass
+
+    def scaled_pos(self, pos):
+        return (pos[0] // self.game.ZOOM_FACTOR, pos[1] // self.game.ZOOM_FACTOR)
+
+
+class MenuScene(Scene):
+    state = GameState.MENU
+    animated = True  # vento animado
+
+    def __init__(self, game):
+        super().__init__(game)
+        # Calculate new y-positions (15% lower)
+        start_y = int(game.GAME_HEIGHT * 0.65)  # 65% down the screen instead of 50%
+        quit_y = start_y + 60  # Keep the same spacing between buttons
+        self.start_game_button = Button(game.GAME_WIDTH // 2 - 100, start_y, 200, 50, "Start Game", 'green')
+        self.quit_button = Button(game.GAME_WIDTH // 2 - 100, quit_y, 200, 50, "Quit", 'red')
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            scaled_pos = self.scaled_pos(event.pos)
+            if self.start_game_button.is_clicked(scaled_pos):
+                self.game.switch(GameState.VILLAGE)
+            elif self.quit_button.is_clicked(scaled_pos):
+                self.game.quit()
+
+    def update(self, dt):
+        self.game.wind_effect.update(dt)
+
+    def render(self, surface):
+        game = self.game
+        surface.blit(game.menu_background, (0, 0))
+        surface.blit(game.wind_effect.image, (0, 0))
+        game.draw_text('Shinobi Offline', 48, game.GAME_WIDTH // 2, game.GAME_HEIGHT // 4)
+        self.start_game_button.draw(surface)
+        self.quit_button.draw(surface)
+
+
+class VillageScene(Scene):
+    state = GameState.VILLAGE
+
+    def enter(self):
+        # Enquanto o jogador escolhe, o primeiro nível de cada missão já vai sendo gerado
+        for mission in mission_data.values():
+            self.game.prepare_level(mission['levels'][0])
+
+    def section(self):
+        # Divide the screen into three vertical sections
+        mouse_pos = pygame.mouse.get_pos()
+        x = self.scaled_pos(mouse_pos)[0]
+        width = self.game.GAME_WIDTH
+        if x < width // 3:
+            return 0
+        if x < (width * 2) // 3:
+            return 1
+        return 2
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            self.game.switch((GameState.BARRACKS, GameState.OFFICE, GameState.SHOP)[self.section()])
+
+    def render(self, surface):
+        game = self.game
+        surface.blit(game.village_background, (0, 0))
+
+        # Draw building images
+        for building, image in game.buildings.items():
+            if building == 'office':
+                surface.blit(image, (game.GAME_WIDTH // 3, 0))
+            else:
+                surface.blit(image, (0, 0))
+
+        # Highlight the section the mouse is over
+        highlight_rect = pygame.Rect(0, 0, game.GAME_WIDTH // 3, game.GAME_HEIGHT)
+        highlight_rect.left = (game.GAME_WIDTH * self.section()) // 3
+        pygame.draw.rect(surface, (255, 255, 0, 100), highlight_rect, 3)  # Yellow outline
+
+        game.draw_text(f"Gold: {game.player.gold}", 24, game.GAME_WIDTH - 100, 50, color=(255, 215, 0))
+
+
+class BuildingScene(Scene):
+    """Interior com uma lista de botões e o botão Back para a vila."""
+
+    title = ''
+    show_gold = True
+
+    def __init__(self, game, background):
+        super().__init__(game)
+        self.background = background
+        self.back_button = Button(50, game.GAME_HEIGHT - 70, 100, 50, "Back", 'red')
+        self.buttons = {}
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            scaled_pos = self.scaled_pos(event.pos)
+            if self.back_button.is_clicked(scaled_pos):
+                self.game.switch(GameState.VILLAGE)
+            for key, button in self.buttons.items():
+                if button.is_clicked(scaled_pos):
+                    self.clicked(key)
+
+    def clicked(self, key):
+        pass
+
+    def render(self, surface):
+        game = self.game
+        surface.blit(self.background, (0, 0))
+        for button in self.buttons.values():
+            button.draw(surface)
+        self.back_button.draw(surface)
+        game.draw_text(self.title, 36, game.GAME_WIDTH // 2, 50)
+        if self.show_gold:
+            game.draw_text(f"Gold: {game.player.gold}", 24, game.GAME_WIDTH - 100, 50, color=(255, 215, 0))
+
+
+class OfficeScene(BuildingScene):
+    state = GameState.OFFICE
+    title = "Available Missions"
+    show_gold = False
+
+    def __init__(self, game):
+        super().__init__(game, game.office_inside)
+        y_offset = 100
+        for mission_id, mission in mission_data.items():
+            self.buttons[mission_id] = Button(game.GAME_WIDTH // 2 - 150, y_offset, 300, 50, f"Mission {mission_id}: {mission['name']}", 'blue')
+            y_offset += 60
+
+    def clicked(self, mission_id):
+        self.game.start_mission(mission_id)
+
+
+class ShopScene(BuildingScene):
+    state = GameState.SHOP
+    title = "Weapon Shop"
+
+    def __init__(self, game):
+        super().__init__(game, game.shop_inside)
+        y_offset = 100
+        for weapon_name, weapon_info in weapon_data.items():
+            if weapon_info.get('type') in ['melee', 'ranged']:  # Only show melee and ranged weapons
+                price = weapon_info.get('price', 100)  # Default price if not specified
+                self.buttons[weapon_name] = Button(game.GAME_WIDTH // 2 - 150, y_offset, 300, 50, f"Buy {weapon_name.capitalize()} ({price} gold)", 'green')
+                y_offset += 60
+
+    def clicked(self, weapon_name):
+        price = weapon_data[weapon_name].get('price', 100)
+        if self.game.player.gold >= price:
+            self.game.player.gold -= price
+            # Add weapon to player's inventory (you'll need to implement this)
+            print(f"Bought {weapon_name}")  # Placeholder for inventory addition
+
+
+class BarracksScene(BuildingScene):
+    state = GameState.BARRACKS
+    title = "Mercenary Barracks"
+
+    def __init__(self, game):
+        super().__init__(game, game.barracks_inside)
+        y_offset = 100
+        for ally_name, ally_info in ally_data.items():
+            price = ally_info.get('price', 200)  # Default price if not specified
+            self.buttons[ally_name] = Button(game.GAME_WIDTH // 2 - 150, y_offset, 300, 50, f"Hire {ally_name} ({price} gold)", 'gold')
+            y_offset += 60
+
+    def clicked(self, ally_name):
+        price = ally_data[ally_name].get('price', 200)
+        if self.game.player.gold >= price:
+            self.game.player.gold -= price
+            # Add ally to player's team (you'll need to implement this)
+            print(f"Hired {ally_name}")  # Placeholder for ally addition
+
+
+class LoadingScene(Scene):
+    """Barra de progresso enquanto o layout do próximo nível é gerado na outra thread."""
+
+    state = GameState.LOADING
+    animated = True
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.preparation = None
+        self.shown = False
+
+    def enter(self):
+        self.shown = False
+
+    def update(self, dt):
+        # Liga o nível só depois de a tela ter aparecido pelo menos uma vez
+        if self.shown and self.preparation.done:
+            self.game.bind_level(self.preparation)
+
+    def render(self, surface):
+        game = self.game
+        surface.fill('black')
+        game.draw_text(f'Level {self.preparation.level_number}', 36, game.GAME_WIDTH // 2, game.GAME_HEIGHT // 2 - 50)
+        bar = pygame.Rect(0, 0, game.GAME_WIDTH // 2, 12)
+        bar.center = (game.GAME_WIDTH // 2, game.GAME_HEIGHT // 2 + 20)
+        filled = bar.copy()
+        filled.width = int(bar.width * self.preparation.progress)
+        pygame.draw.rect(surface, (255, 215, 0), filled)
+        pygame.draw.rect(surface, (255, 255, 255), bar, 1)
+        self.shown = True
+
+
+class PlayingScene(Scene):
+    state = GameState.PLAYING
+    animated = True
+    fps = RENDER_FPS
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            events.publish(KEYDOWN, event.key)
+            if event.key == pygame.K_ESCAPE:
+                self.game.push(GameState.PAUSED)
+
+    def update(self, dt):
+        game = self.game
+        level = game.level
+        level.advance(dt)
+
+        if level.player.hp <= 0:
+            game.switch(GameState.GAME_OVER)
+        elif level.enemy_count == 0 and level.player.rect.right >= level.get_map_rect().right - 64:
+            if game.mission_level_index < len(game.current_mission['levels']):
+                game.start_next_level()
+            else:
+                game.complete_mission()
+
+    def render(self, surface):
+        # Só desenha na game_surface: Game.run escala (apply_zoom) e faz o único flip do quadro
+        level = self.game.level
+        level.draw_interpolated(surface, level.accumulator / FIXED_DT)
+
+    def frame_done(self, frame_ms):
+        self.game.level.particles.budget.adapt(frame_ms)
+
+
+class PauseScene(Scene):
+    state = GameState.PAUSED
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.overlay = pygame.Surface((game.GAME_WIDTH, game.GAME_HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 128))
+        self.buttons = {
+            'resume': Button(game.GAME_WIDTH // 2 - 100, game.GAME_HEIGHT // 2, 200, 50, "Resume", 'green'),
+            'quit': Button(game.GAME_WIDTH // 2 - 100, game.GAME_HEIGHT // 2 + 60, 200, 50, "Quit to Menu", 'red')
+        }
+        self.background = None
+
+    def enter(self):
+        # O último quadro do jogo fica guardado: cada redesenho escurece a mesma imagem uma vez só
+        self.background = self.game.game_surface.copy()
+
+    def exit(self):
+        self.background = None
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            scaled_pos = self.scaled_pos(event.pos)
+            if self.buttons['resume'].is_clicked(scaled_pos):
+                self.game.pop()
+            elif self.buttons['quit'].is_clicked(scaled_pos):
+                self.game.switch(GameState.MENU)
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.game.pop()
+
+    def render(self, surface):
+        surface.blit(self.background, (0, 0))
+        surface.blit(self.overlay, (0, 0))
+        for button in self.buttons.values():
+            button.draw(surface)
+
+
+class MissionCompleteScene(Scene):
+    state = GameState.MISSION_COMPLETE
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.gold_reward = 0
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
+            self.game.switch(GameState.VILLAGE)
+
+    def render(self, surface):
+        game = self.game
+        surface.fill('black')
+        game.draw_text('Mission Complete!', 48, game.GAME_WIDTH // 2, game.GAME_HEIGHT // 2 - 50)
+        game.draw_text(f'Gold earned: {self.gold_reward}', 24, game.GAME_WIDTH // 2, game.GAME_HEIGHT // 2 + 50)
+        game.draw_text('Press any key to continue', 24, game.GAME_WIDTH // 2, game.GAME_HEIGHT // 2 + 100)
+
+
+class GameOverScene(Scene):
+    state = GameState.GAME_OVER
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.game_over_text = game.font.render("You are dead.", True, (255, 255, 255))
+        self.restart_button = Button(game.GAME_WIDTH // 2 - 100, game.GAME_HEIGHT // 2 + 100, 200, 50, "Restart", 'green')
+        self.quit_button = Button(game.GAME_WIDTH // 2 - 100, game.GAME_HEIGHT // 2 + 160, 200, 50, "Quit to Menu", 'red')
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            scaled_pos = self.scaled_pos(event.pos)
+            #if self.restart_button.is_clicked(scaled_pos):
+            #    self.game.reset_game()
+            #    self.game.switch(GameState.PLAYING)
+            if self.quit_button.is_clicked(scaled_pos):
+                self.game.reset_game()
+
+    def render(self, surface):
+        game = self.game
+        surface.fill('black')
+        text = self.game_over_text
+        surface.blit(text, (game.GAME_WIDTH // 2 - text.get_width() // 2, game.GAME_HEIGHT // 2 - text.get_height() // 2))
+        #self.restart_button.draw(surface)
+        self.quit_button.draw(surface)
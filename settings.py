@@ -2,6 +2,20 @@ WIDTH = 1200
 HEIGHT = 900
 FPS = 60
 FIXED_DT = 1 / FPS
+RENDER_FPS = 60  # Limite de quadros desenhados por segundo (0 = sem limite); a simulação fica sempre em FPS
+MENU_FPS = 30  # Limite das telas fora do jogo (menu, vila, lojas, pausa); as estáticas só redesenham com input
+MAX_SIM_STEPS = 5  # Passos fixos por quadro no máximo: sob carga o jogo desacelera em vez de travar
+GROUND_CHUNK_TILES = 20  # 20 * 32 = 640 px por chunk: a visão de 600x450 cruza no máximo 2x2 chunks
+SMOOTH_SCALING = False  # Zoom da tela com smoothscale (suave) em vez de vizinho mais próximo (pixel art nítida)
+VIEW_PADDING = 96  # Margem (px) ao redor da câmera para o culling dos sprites
+PARTICLE_BUDGET = 3000  # Teto inicial de partículas vivas; se ajusta ao tempo de quadro medido
+PARTICLE_BUDGET_RANGE = (400, 6000)  # Limites do teto adaptativo
+PARTICLE_LOD_NEAR = 256  # Até essa distância (px) fora da câmera os emissores só emitem parte das partículas
+ROTATION_STEPS = 72  # Ângulos pré-rotacionados por imagem de projétil (5 graus cada)
+TEXT_CACHE_SIZE = 256  # Textos renderizados guardados (LRU) por text_display.render_text
+LEVEL_CACHE = True  # Guarda os descritores de nível gerados (por nível e semente) em disco
+LEVEL_CACHE_DIR = None  # None = pasta 'levels' dentro da pasta de dados do usuário (SHINOBI_LEVEL_CACHE no ambiente tem prioridade)
+LEVEL_CACHE_FILES = 100  # Descritores guardados no máximo; os mais antigos são apagados
 # Dados dos níveis
 level_data = {
     1: {'dimensions':  (30,  23),  'num_enemies':     1, 'experience':    350},
@@ -87,6 +101,13 @@ sound_data = {
     'slash': 'sounds/slash.wav',
     'explosion': 'sounds/explosion.wav'
 }
+SOUND_CHANNELS = 8  # Canais do mixer reservados para o SoundBank
+# Limites por som: (vozes tocando ao mesmo tempo, intervalo mínimo em ms entre dois disparos)
+sound_limits = {
+    'default': (2, 50),
+    'spark': (3, 60),
+    'electric_aura': (1, 200),
+}
 
 
 
@@ -0,0 +1,116 @@
+import pygame
+
+
+class SpatialGrid:
+    """Uniform grid over world space. Each cell holds the sprites whose rect touches it.
+
+    sync() keeps the grid in step with a sprite group once per frame: new sprites are
+    inserted, sprites that moved to other cells are re-bucketed and dead ones dropped.
+    A pooled sprite that was recycled since the last sync (its `generation` changed)
+    is inserted again, as a new sprite. query() returns the sprites touching a rect
+    in the order they were inserted, so draw order is preserved.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}         # (cx, cy) -> {sprite: None}
+        self.sprite_cells = {}  # sprite -> (x0, y0, x1, y1) cell range
+        self.rects = {}         # sprite -> rect the sprite was bucketed with
+        self.order = {}         # sprite -> insertion number
+        self.generations = {}   # sprite -> generation (Pooled) quando foi inserido
+        self.next_order = 0
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size if rect.width else rect.left // size,
+                (rect.bottom - 1) // size if rect.height else rect.top // size)
+
+    def insert(self, sprite):
+        cell_range = self.cell_range(sprite.rect)
+        self.sprite_cells[sprite] = cell_range
+        self.rects[sprite] = pygame.Rect(sprite.rect)
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+        self.generations[sprite] = getattr(sprite, 'generation', 0)
+        self._bucket(sprite, cell_range)
+
+    def remove(self, sprite):
+        cell_range = self.sprite_cells.pop(sprite, None)
+        if cell_range is None:
+            return
+        self._unbucket(sprite, cell_range)
+        del self.rects[sprite]
+        del self.order[sprite]
+        del self.generations[sprite]
+
+    def move(self, sprite):
+        rect = sprite.rect
+        if self.rects[sprite] == rect:
+            return
+        self.rects[sprite].update(rect)
+        cell_range = self.cell_range(rect)
+        old_range = self.sprite_cells[sprite]
+        if cell_range != old_range:
+            self._unbucket(sprite, old_range)
+            self._bucket(sprite, cell_range)
+            self.sprite_cells[sprite] = cell_range
+
+    def sync(self, sprites):
+        count = 0
+        rects = self.rects
+        generations = self.generations
+        for sprite in sprites:
+            count += 1
+            rect = rects.get(sprite)
+            if rect is None:
+                self.insert(sprite)
+            elif generations[sprite] != getattr(sprite, 'generation', 0):
+                # Reaproveitado por um Pool entre dois syncs: entra de novo, no fim da ordem
+                self.remove(sprite)
+                self.insert(sprite)
+            elif rect != sprite.rect:
+                self.move(sprite)
+        if len(self.sprite_cells) > count:
+            live = set(sprites)
+            for sprite in [s for s in self.sprite_cells if s not in live]:
+                self.remove(sprite)
+
+    def clear(self):
+        self.cells.clear()
+        self.sprite_cells.clear()
+        self.rects.clear()
+        self.order.clear()
+        self.generations.clear()
+
+    def query(self, rect):
+        x0, y0, x1, y1 = self.cell_range(rect)
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        order = self.order
+        return sorted((s for s in found if rect.colliderect(s.rect)), key=order.__getitem__)
+
+    def _bucket(self, sprite, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cells[(cx, cy)] = cell = {}
+                cell[sprite] = None
+
+    def _unbucket(self, sprite, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is not None:
+                    cell.pop(sprite, None)
+                    if not cell:
+                        del cells[(cx, cy)]
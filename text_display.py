@@ -1,12 +1,113 @@
 import pygame
+from collections import OrderedDict
+from settings import *
+from pooling import Pool, Pooled
 
-class FloatingText(pygame.sprite.Sprite):
+_fonts = {}
+_text_cache = OrderedDict()
+_text_stats = {'hits': 0, 'misses': 0}
+_digit_atlases = {}
+
+OUTLINE_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+def get_font(name, size):
+    """Font registry: one pygame Font per (file, size). name None = default pygame font."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+
+def color_key(color):
+    return color if isinstance(color, (str, tuple)) else tuple(color)
+
+
+def render_text(text, size, color, font=None, outline=None):
+    """Rendered text, from an LRU cache of (text, font, size, color, outline).
+
+    With an outline colour the text gets a 1 px border (the surface is 2 px bigger).
+    The returned surface is shared: blit it, never draw on it.
+    """
+    key = (text, font, size, color_key(color), outline and color_key(outline))
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_stats['hits'] += 1
+        _text_cache.move_to_end(key)
+        return surface
+    _text_stats['misses'] += 1
+    surface = render_outlined(get_font(font, size), text, color, outline)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
+
+def render_outlined(font, text, color, outline=None):
+    text_surface = font.render(text, True, color)
+    if outline is None:
+        return text_surface
+    # Contorno: o texto na cor do contorno uma vez só, colado nas 8 direções
+    outline_text = font.render(text, True, outline)
+    surface = pygame.Surface((text_surface.get_width() + 2, text_surface.get_height() + 2), pygame.SRCALPHA)
+    surface.blits([(outline_text, (dx + 1, dy + 1)) for dx, dy in OUTLINE_OFFSETS], doreturn=False)
+    surface.blit(text_surface, (1, 1))
+    return surface
+
+
+class DigitAtlas:
+    """The digits 0-9 of one font/size/colour rendered once (with outline); render()
+    builds a number by blitting the glyphs side by side, without touching the font."""
+
+    def __init__(self, font, size, color, outline=None):
+        font_object = get_font(font, size)
+        self.pad = 2 if outline is not None else 0
+        self.glyphs = {}
+        self.advances = {}
+        for digit in '0123456789':
+            self.glyphs[digit] = render_outlined(font_object, digit, color, outline)
+            self.advances[digit] = font_object.size(digit)[0]
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def render(self, number):
+        text = str(number)
+        width = sum(self.advances[digit] for digit in text) + self.pad
+        surface = pygame.Surface((width, self.height), pygame.SRCALPHA)
+        x = 0
+        blits = []
+        for digit in text:
+            blits.append((self.glyphs[digit], (x, 0)))
+            x += self.advances[digit]
+        surface.blits(blits, doreturn=False)
+        return surface
+
+
+def digit_atlas(size, color, font=None, outline=None):
+    key = (font, size, color_key(color), outline and color_key(outline))
+    atlas = _digit_atlases.get(key)
+    if atlas is None:
+        atlas = _digit_atlases[key] = DigitAtlas(font, size, color, outline)
+    return atlas
+
+
+def text_stats():
+    return dict(_text_stats, cached=len(_text_cache), fonts=len(_fonts), atlases=len(_digit_atlases))
+
+class FloatingText(Pooled, pygame.sprite.Sprite):
     def __init__(self, text, target_rect, color, camera, groups, duration=1, speed=30):
-        super().__init__(groups)
+        super().__init__()
+        self.text = None
+        self.color = None
+        self.reset(text, target_rect, color, camera, groups, duration, speed)
+
+    def reset(self, text, target_rect, color, camera, groups, duration=1, speed=30):
+        if text != self.text or color != self.color:
+            # 'MISS' e os mesmos números se repetem muito: só renderiza de novo se mudou
+            self.image = self.create_image(text, color)
         self.text = text
         self.color = color
         self.camera = camera
-        self.image = self.create_image(text, color)
         if isinstance(target_rect, pygame.Rect):
             self.rect = self.image.get_rect(midbottom=target_rect.midtop)
         else:
@@ -14,21 +115,15 @@ class FloatingText(pygame.sprite.Sprite):
         self.duration = duration
         self.speed = speed
         self.start_time = pygame.time.get_ticks()
+        if not isinstance(groups, (list, tuple)):
+            groups = [groups]
+        self.add(*groups)
 
     def create_image(self, text, color):
-        font = pygame.font.Font('freesansbold.ttf', 14)  # Use uma fonte diferente aqui
-        text_surface = font.render(text, True, color)
-        
-        # Create outline
-        outline_color = (0, 0, 0)
-        outline_surface = pygame.Surface((text_surface.get_width() + 2, text_surface.get_height() + 2), pygame.SRCALPHA)
-        for dx in (-1, 0, 1):
-            for dy in (-1, 0, 1):
-                if dx != 0 or dy != 0:
-                    outline_surface.blit(font.render(text, True, outline_color), (dx + 1, dy + 1))
-        outline_surface.blit(text_surface, (1, 1))
-        
-        return outline_surface
+        # Números de dano vêm do atlas de dígitos; o resto ('MISS'...) do cache de texto
+        if text.isdigit():
+            return digit_atlas(14, color, 'freesansbold.ttf', (0, 0, 0)).render(text)
+        return render_text(text, 14, color, 'freesansbold.ttf', (0, 0, 0))
 
     def update(self, dt):
         
@@ -41,3 +136,5 @@ class FloatingText(pygame.sprite.Sprite):
 
     def draw(self, screen):
         screen.blit(self.image, self.camera.apply(self))
+
+FloatingText.pool = Pool(FloatingText, capacity=64)
@@ -1,17 +1,18 @@
 import pygame
 from settings import *
+from assets import load_image
 
 class Tile(pygame.sprite.Sprite):
     def __init__(self, image_path, pos, groups, collidable=False, rect_size=None, tile_type="default", effects=None):
-        super().__init__(*groups)
-        self.image = pygame.image.load(image_path).convert_alpha()
+        super().__init__()
+        self.image, self.mask = load_image(image_path)
         self.rect = self.image.get_rect(bottomright=pos)
         self.collidable = collidable
         self.tile_type = tile_type
         self.effects = effects if effects is not None else []
         self.image_path = image_path
-        self.mask = pygame.mask.from_surface(self.image)
         self.pos = pos*32
+        self.add(*groups)  # Só entra nos grupos com rect definido (GroundLayer usa o rect ao adicionar)
 
         
         
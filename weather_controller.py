@@ -1,6 +1,7 @@
 import pygame
 import random
 from effects import Particle2, RainParticle
+from particles import ParticleSystem
 
 class WeatherController:
     def __init__(self, screen_width, screen_height, particle_group):
@@ -30,6 +31,7 @@ class WeatherController:
         
         self.snow_accumulation = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
         self.snow_accumulation.fill((0, 0, 0, 0))  # Transparent surface
+        self.rain_trails = ParticleSystem(capacity=256)  # rastros da chuva, em coordenadas de tela
 
     def update(self, dt):
         self.weather_change_timer += dt * 1000  # Convert to milliseconds
@@ -75,6 +77,7 @@ class WeatherController:
         
     def update_particles(self, dt):
         self.create_precipitation()
+        self.rain_trails.update(dt)
         
         for particle in self.particle_group:
             particle.update(dt)
@@ -90,7 +93,8 @@ class WeatherController:
                 pos = (random.randint(self.rain_spawn_area.left, self.rain_spawn_area.right),
                        random.randint(self.rain_spawn_area.top, self.rain_spawn_area.bottom))
                 RainParticle(pos, [self.particle_group], self.screen_width, self.screen_height, 
-                             lifespan=2000, wind_direction=self.wind_direction, wind_speed=self.wind_speed)
+                             lifespan=2000, wind_direction=self.wind_direction, wind_speed=self.wind_speed,
+                             trails=self.rain_trails)
         elif self.current_weather == 'snowy':
             while len(self.snow_particles) < self.current_max_snow_particles:
                 if random.choice([True, False]):